@@ -3,41 +3,39 @@ import subprocess
 import sys
 
 
-def run(cmd: str) -> None:
-    """Run a shell command and exit if it fails."""
-    result = subprocess.run(cmd, shell=True)
+def run(cmd: list[str]) -> None:
+    """Run a command and exit if it fails."""
+    result = subprocess.run(cmd, check=False)
     if result.returncode != 0:
         sys.exit(result.returncode)
 
 
 def source_to_anki() -> None:
     """Export source files to Anki."""
-    run("uv run brainbrew run recipes/source_to_anki.yaml")
+    run(["uv", "run", "brainbrew", "run", "recipes/source_to_anki.yaml"])
 
 
 def anki_to_source() -> None:
     """Import Anki changes back to source."""
-    run("uv run brainbrew run recipes/anki_to_source.yaml")
+    run(["uv", "run", "brainbrew", "run", "recipes/anki_to_source.yaml"])
 
 
 def validate() -> None:
     """Validate references in CSV files."""
-    args = " ".join(sys.argv[2:])
-    run(f"uv run python tools/validate_format.py {args}")
-    run(f"uv run python tools/validate_references.py {args}")
-    run(f"uv run python tools/validate_images.py {args}")
+    args = sys.argv[2:]
+    run(["uv", "run", "python", "tools/validate_format.py", *args])
+    run(["uv", "run", "python", "tools/validate_references.py", *args])
+    run(["uv", "run", "python", "tools/validate_images.py", *args])
 
 
 def list_relationships() -> None:
     """List relationships between notes."""
-    args = " ".join(sys.argv[2:])
-    run(f"uv run python tools/list_relationships.py {args}")
+    run(["uv", "run", "python", "tools/list_relationships.py", *sys.argv[2:]])
 
 
 def bump_version() -> None:
     """Bump version in description.html."""
-    args = " ".join(sys.argv[2:])
-    run(f"uv run python tools/bump_version.py {args}")
+    run(["uv", "run", "python", "tools/bump_version.py", *sys.argv[2:]])
 
 
 def sync() -> None:
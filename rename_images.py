@@ -2,44 +2,63 @@
 """Rename images to uh_name-name.jpg format and update CSV references."""
 
 import csv
+import os
 import re
+import sys
 from pathlib import Path
-from html.parser import HTMLParser
 
+# src attribute of an img tag, double-quoted, single-quoted or unquoted
+IMG_SRC_RE = re.compile(
+    r"""<img\b[^>]*?\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE,
+)
+PUNCTUATION_RE = re.compile(r"[^\w\s-]")
+DASHES_RE = re.compile(r"-+")
+# Deletes exactly the ASCII characters PUNCTUATION_RE would remove
+ASCII_PUNCTUATION_TABLE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if PUNCTUATION_RE.match(chr(c)))
+)
 
-class ImgTagParser(HTMLParser):
-    """Extract src attribute from img tags."""
-
-    def __init__(self):
-        super().__init__()
-        self.src = None
-
-    def handle_starttag(self, tag, attrs):
-        if tag == "img":
-            for attr, value in attrs:
-                if attr == "src":
-                    self.src = value
+# Read and write the CSV in 1 MiB chunks
+CSV_BUFFER_SIZE = 1 << 20
 
 
 def normalize_name(name: str) -> str:
     """Convert name to lowercase with hyphens."""
     # Remove punctuation and extra spaces
-    name = re.sub(r"[^\w\s-]", "", name)
+    if name.isascii():
+        name = name.translate(ASCII_PUNCTUATION_TABLE)
+    else:
+        name = PUNCTUATION_RE.sub("", name)
     # Convert to lowercase and replace spaces with hyphens
     name = name.lower().strip().replace(" ", "-")
     # Remove consecutive hyphens
-    name = re.sub(r"-+", "-", name)
+    name = DASHES_RE.sub("-", name)
     return name
 
 
-def extract_image_filename(picture_html: str) -> str | None:
-    """Extract filename from img tag HTML."""
+def find_image_src(picture_html: str) -> tuple[str, int, int] | None:
+    """Find the img src in HTML and return (filename, start, end) of its value."""
     if not picture_html or "<img" not in picture_html:
         return None
 
-    parser = ImgTagParser()
-    parser.feed(picture_html)
-    return parser.src
+    match = IMG_SRC_RE.search(picture_html)
+    if not match:
+        return None
+    group = next(i for i, g in enumerate(match.groups(), 1) if g is not None)
+    return match.group(group), match.start(group), match.end(group)
+
+
+def extract_image_filename(picture_html: str) -> str | None:
+    """Extract filename from img tag HTML."""
+    src = find_image_src(picture_html)
+    return src[0] if src else None
+
+
+def write_lines(lines: list[str]) -> None:
+    """Write lines to stdout in a single call."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -49,8 +68,12 @@ def main():
     # Read CSV and build rename mapping
     rename_map = {}  # old_filename -> new_filename
     rows = []
+    row_images = []  # (row, old_filename, src_start, src_end) per image
+    log_lines = []
 
-    with open(csv_path, "r", encoding="utf-8") as f:
+    with open(
+        csv_path, "r", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE
+    ) as f:
         reader = csv.DictReader(f)
         for row in reader:
             rows.append(row)
@@ -58,9 +81,10 @@ def main():
             name = row["name"]
             picture_html = row["picture"]
 
-            old_filename = extract_image_filename(picture_html)
-            if not old_filename:
+            src = find_image_src(picture_html)
+            if not src:
                 continue
+            old_filename, src_start, src_end = src
 
             # Get file extension
             ext = Path(old_filename).suffix
@@ -69,32 +93,37 @@ def main():
             new_filename = f"uh_{normalize_name(name)}{ext}"
 
             rename_map[old_filename] = new_filename
-            print(f"{old_filename} -> {new_filename}")
+            row_images.append((row, old_filename, src_start, src_end))
+            log_lines.append(f"{old_filename} -> {new_filename}")
+
+    write_lines(log_lines)
 
     # Rename physical files
     print("\nRenaming files...")
+    # One directory listing instead of a stat call per image
+    with os.scandir(media_path) as entries:
+        existing = {entry.name for entry in entries}
+    log_lines = []
     for old_name, new_name in rename_map.items():
-        old_path = media_path / old_name
-        new_path = media_path / new_name
-
-        if old_path.exists():
-            old_path.rename(new_path)
-            print(f"Renamed: {old_name}")
+        if old_name in existing:
+            os.rename(media_path / old_name, media_path / new_name)
+            log_lines.append(f"Renamed: {old_name}")
         else:
-            print(f"Warning: File not found: {old_name}")
+            log_lines.append(f"Warning: File not found: {old_name}")
+    write_lines(log_lines)
 
     # Update CSV with new filenames
     print("\nUpdating CSV...")
-    for row in rows:
+    for row, old_filename, src_start, src_end in row_images:
         picture_html = row["picture"]
-        old_filename = extract_image_filename(picture_html)
-
-        if old_filename and old_filename in rename_map:
-            new_filename = rename_map[old_filename]
-            row["picture"] = picture_html.replace(old_filename, new_filename)
+        row["picture"] = (
+            picture_html[:src_start] + rename_map[old_filename] + picture_html[src_end:]
+        )
 
     # Write updated CSV
-    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+    with open(
+        csv_path, "w", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE
+    ) as f:
         fieldnames = [
             "guid",
             "name",
@@ -5,10 +5,13 @@ import re
 import sys
 from pathlib import Path
 
+VERSION_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)(-dev)?$")
+DESCRIPTION_VERSION_RE = re.compile(r"<b>Version: </b>(\d+\.\d+\.\d+(?:-dev)?)")
+
 
 def parse_version(version: str) -> tuple[int, int, int, bool]:
     """Parse version string like '0.2.0' or '0.2.0-dev'"""
-    match = re.match(r"^(\d+)\.(\d+)\.(\d+)(-dev)?$", version)
+    match = VERSION_RE.match(version)
     if not match:
         raise ValueError(f"Invalid version format: {version}")
     major, minor, patch, dev = match.groups()
@@ -66,7 +69,7 @@ def main():
 
     # Read current version
     content = description_file.read_text()
-    match = re.search(r"<b>Version: </b>(\d+\.\d+\.\d+(?:-dev)?)", content)
+    match = DESCRIPTION_VERSION_RE.search(content)
     if not match:
         print("Error: Could not find version in description.html")
         sys.exit(1)
@@ -80,10 +83,8 @@ def main():
 
     new_version = bump_version(current_version, bump_type, add_dev)
 
-    # Update file
-    new_content = content.replace(
-        f"<b>Version: </b>{current_version}", f"<b>Version: </b>{new_version}"
-    )
+    # Update file, replacing only the version that was matched
+    new_content = content[: match.start(1)] + new_version + content[match.end(1) :]
     description_file.write_text(new_content)
 
     print(f"Bumped version: {current_version} → {new_version}")
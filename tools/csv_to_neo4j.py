@@ -5,6 +5,8 @@ import argparse
 import csv
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -16,6 +18,7 @@ from utils import get_data_dir, parse_reference
 load_dotenv()
 
 
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> tuple[int | None, bool | None]:
     """Parse a date string into (year, is_approximate).
 
@@ -49,23 +52,36 @@ def parse_date(date_str: str) -> tuple[int | None, bool | None]:
 
 
 def load_csv(path: Path) -> list[dict]:
-    """Load a CSV file and return list of row dicts."""
-    with open(path, encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+    """Load a CSV file and return list of row dicts.
+
+    Rows are kept in memory because each one is read several times (lookups,
+    nodes, tags, edges) and transaction functions may be retried.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        return [dict(zip(header, values)) for values in reader if values]
 
 
 def drop_all(tx):
     """Drop all constraints, indexes, and data."""
-    # Get and drop all constraints
-    constraints = tx.run("SHOW CONSTRAINTS").data()
-    for c in constraints:
-        tx.run(f"DROP CONSTRAINT {c['name']}")
-
-    # Get and drop all indexes
-    indexes = tx.run("SHOW INDEXES").data()
-    for idx in indexes:
-        if idx["type"] != "LOOKUP":  # Don't drop built-in lookup indexes
-            tx.run(f"DROP INDEX {idx['name']}")
+    # Collect names up front. Indexes backing a constraint go away with the
+    # constraint, and built-in lookup indexes are never dropped.
+    constraints = tx.run("SHOW CONSTRAINTS YIELD name").value()
+    indexes = tx.run(
+        """
+        SHOW INDEXES YIELD name, type, owningConstraint
+        WHERE type <> 'LOOKUP' AND owningConstraint IS NULL
+        RETURN name
+        """
+    ).value()
+
+    for name in constraints:
+        tx.run(f"DROP CONSTRAINT `{name}` IF EXISTS")
+    for name in indexes:
+        tx.run(f"DROP INDEX `{name}` IF EXISTS")
 
 
 def clear_database(tx):
@@ -92,142 +108,222 @@ def create_constraints(tx):
     )
 
 
-def create_persons(tx, persons: list[dict], person_lookup: dict):
+def create_indexes(tx):
+    """Create the indexes used by neo4j_query.py lookups and search."""
+    # Case-insensitive lookups match on name_lower, question_lower and text_lower
+    tx.run(
+        "CREATE INDEX person_name_lower IF NOT EXISTS FOR (p:Person) ON (p.name_lower)"
+    )
+    tx.run(
+        "CREATE INDEX event_name_lower IF NOT EXISTS FOR (e:Event) ON (e.name_lower)"
+    )
+    tx.run(
+        "CREATE INDEX qa_question_lower IF NOT EXISTS FOR (q:QA) ON (q.question_lower)"
+    )
+    tx.run(
+        "CREATE INDEX cloze_text_lower IF NOT EXISTS FOR (c:Cloze) ON (c.text_lower)"
+    )
+    # Text indexes on the same properties serve the CONTAINS scan that search
+    # falls back to without the full-text index
+    tx.run(
+        "CREATE TEXT INDEX person_name_lower_text IF NOT EXISTS FOR (p:Person) ON (p.name_lower)"
+    )
+    tx.run(
+        "CREATE TEXT INDEX event_name_lower_text IF NOT EXISTS FOR (e:Event) ON (e.name_lower)"
+    )
+    tx.run(
+        "CREATE TEXT INDEX qa_question_lower_text IF NOT EXISTS FOR (q:QA) ON (q.question_lower)"
+    )
+    tx.run(
+        "CREATE TEXT INDEX cloze_text_lower_text IF NOT EXISTS FOR (c:Cloze) ON (c.text_lower)"
+    )
+    # Time period overlap filters in find-related
+    tx.run(
+        "CREATE INDEX person_birth_year IF NOT EXISTS FOR (p:Person) ON (p.birth_year)"
+    )
+    tx.run(
+        "CREATE INDEX person_death_year IF NOT EXISTS FOR (p:Person) ON (p.death_year)"
+    )
+    tx.run(
+        "CREATE INDEX event_start_year IF NOT EXISTS FOR (e:Event) ON (e.start_year)"
+    )
+    tx.run("CREATE INDEX event_end_year IF NOT EXISTS FOR (e:Event) ON (e.end_year)")
+    tx.run(
+        """
+        CREATE FULLTEXT INDEX entity_search IF NOT EXISTS
+        FOR (n:Person|Event|QA|Cloze) ON EACH [n.name, n.question, n.text]
+        """
+    )
+
+
+def create_persons(tx, persons: list[dict]):
     """Create Person nodes."""
+    rows = []
     for row in persons:
         birth_year, birth_approximate = parse_date(row["date of birth"])
         death_year, death_approximate = parse_date(row["date of death"])
-        tx.run(
-            """
-            CREATE (p:Person {
-                name: $name,
-                known_for: $known_for,
-                birth_year: $birth_year,
-                birth_approximate: $birth_approximate,
-                death_year: $death_year,
-                death_approximate: $death_approximate,
-                picture: $picture,
-                notes: $notes,
-                source_license: $source_license,
-                guid: $guid
-            })
-            """,
-            guid=row["guid"],
-            name=row["name"],
-            known_for=row["known for"],
-            birth_year=birth_year,
-            birth_approximate=birth_approximate,
-            death_year=death_year,
-            death_approximate=death_approximate,
-            picture=row["picture"],
-            notes=row["notes"],
-            source_license=row["source & license"],
+        rows.append(
+            {
+                "guid": row["guid"],
+                "name": row["name"],
+                "name_lower": row["name"].lower(),
+                "known_for": row["known for"],
+                "birth_year": birth_year,
+                "birth_approximate": birth_approximate,
+                "death_year": death_year,
+                "death_approximate": death_approximate,
+                "picture": row["picture"],
+                "notes": row["notes"],
+                "source_license": row["source & license"],
+            }
         )
-        person_lookup[row["name"]] = row["guid"]
 
+    tx.run(
+        """
+        UNWIND $rows AS r
+        CREATE (p:Person {
+            name: r.name,
+            name_lower: r.name_lower,
+            known_for: r.known_for,
+            birth_year: r.birth_year,
+            birth_approximate: r.birth_approximate,
+            death_year: r.death_year,
+            death_approximate: r.death_approximate,
+            picture: r.picture,
+            notes: r.notes,
+            source_license: r.source_license,
+            guid: r.guid
+        })
+        """,
+        rows=rows,
+    )
 
-def create_events(tx, events: list[dict], event_lookup: dict):
+
+def create_events(tx, events: list[dict]):
     """Create Event nodes."""
+    rows = []
     for row in events:
         start_year, start_approximate = parse_date(row["start date"])
         end_year, end_approximate = parse_date(row["end date"])
-        tx.run(
-            """
-            CREATE (e:Event {
-                name: $name,
-                summary: $summary,
-                start_year: $start_year,
-                start_approximate: $start_approximate,
-                end_year: $end_year,
-                end_approximate: $end_approximate,
-                notes: $notes,
-                source_license: $source_license,
-                guid: $guid
-            })
-            """,
-            guid=row["guid"],
-            name=row["name"],
-            summary=row["summary"],
-            start_year=start_year,
-            start_approximate=start_approximate,
-            end_year=end_year,
-            end_approximate=end_approximate,
-            notes=row["notes"],
-            source_license=row["source & license"],
+        rows.append(
+            {
+                "guid": row["guid"],
+                "name": row["name"],
+                "name_lower": row["name"].lower(),
+                "summary": row["summary"],
+                "start_year": start_year,
+                "start_approximate": start_approximate,
+                "end_year": end_year,
+                "end_approximate": end_approximate,
+                "notes": row["notes"],
+                "source_license": row["source & license"],
+            }
         )
-        event_lookup[row["name"]] = row["guid"]
+
+    tx.run(
+        """
+        UNWIND $rows AS r
+        CREATE (e:Event {
+            name: r.name,
+            name_lower: r.name_lower,
+            summary: r.summary,
+            start_year: r.start_year,
+            start_approximate: r.start_approximate,
+            end_year: r.end_year,
+            end_approximate: r.end_approximate,
+            notes: r.notes,
+            source_license: r.source_license,
+            guid: r.guid
+        })
+        """,
+        rows=rows,
+    )
 
 
 def create_qas(tx, qas: list[dict]):
     """Create QA nodes."""
-    for row in qas:
-        tx.run(
-            """
-            CREATE (q:QA {
-                question: $question,
-                answer: $answer,
-                notes: $notes,
-                source_license: $source_license,
-                guid: $guid
-            })
-            """,
-            guid=row["guid"],
-            question=row["question"],
-            answer=row["answer"],
-            notes=row["notes"],
-            source_license=row["source & license"],
-        )
+    rows = [
+        {
+            "guid": row["guid"],
+            "question": row["question"],
+            "question_lower": row["question"].lower(),
+            "answer": row["answer"],
+            "notes": row["notes"],
+            "source_license": row["source & license"],
+        }
+        for row in qas
+    ]
+    tx.run(
+        """
+        UNWIND $rows AS r
+        CREATE (q:QA {
+            question: r.question,
+            question_lower: r.question_lower,
+            answer: r.answer,
+            notes: r.notes,
+            source_license: r.source_license,
+            guid: r.guid
+        })
+        """,
+        rows=rows,
+    )
 
 
 def create_clozes(tx, clozes: list[dict]):
     """Create Cloze nodes."""
-    for row in clozes:
-        tx.run(
-            """
-            CREATE (c:Cloze {
-                text: $text,
-                notes: $notes,
-                source_license: $source_license,
-                guid: $guid
-            })
-            """,
-            guid=row["guid"],
-            text=row["text"],
-            notes=row["notes"],
-            source_license=row["source & license"],
-        )
+    rows = [
+        {
+            "guid": row["guid"],
+            "text": row["text"],
+            "text_lower": row["text"].lower(),
+            "notes": row["notes"],
+            "source_license": row["source & license"],
+        }
+        for row in clozes
+    ]
+    tx.run(
+        """
+        UNWIND $rows AS r
+        CREATE (c:Cloze {
+            text: r.text,
+            text_lower: r.text_lower,
+            notes: r.notes,
+            source_license: r.source_license,
+            guid: r.guid
+        })
+        """,
+        rows=rows,
+    )
 
 
 def create_tags(tx, all_rows: list[dict]):
     """Create unique Tag nodes from all entities."""
-    tags = set()
-    for row in all_rows:
-        if row.get("tags"):
-            for tag in row["tags"].split(", "):
-                tag = tag.strip()
-                if tag:
-                    tags.add(tag)
-
-    for tag in tags:
-        tx.run("CREATE (t:Tag {name: $name})", name=tag)
+    tags = {
+        tag
+        for row in all_rows
+        for tag in map(str.strip, (row.get("tags") or "").split(", "))
+        if tag
+    }
+    tx.run("UNWIND $names AS name CREATE (t:Tag {name: name})", names=list(tags))
 
 
 def create_tag_edges(tx, rows: list[dict], label: str):
     """Create HAS_TAG edges from entities to tags."""
-    for row in rows:
-        if not row.get("tags"):
-            continue
-        for tag in row["tags"].split(", "):
-            tag = tag.strip()
-            if tag:
-                tx.run(
-                    f"""
-                    MATCH (n:{label} {{guid: $guid}}), (t:Tag {{name: $tag}})
-                    CREATE (n)-[:HAS_TAG]->(t)
-                    """,
-                    guid=row["guid"],
-                    tag=tag,
-                )
+    pairs = [
+        {"guid": row["guid"], "tag": tag}
+        for row in rows
+        if row.get("tags")
+        for tag in map(str.strip, row["tags"].split(", "))
+        if tag
+    ]
+    tx.run(
+        f"""
+        UNWIND $pairs AS p
+        MATCH (n:{label} {{guid: p.guid}}), (t:Tag {{name: p.tag}})
+        CREATE (n)-[:HAS_TAG]->(t)
+        """,
+        pairs=pairs,
+    )
 
 
 def create_relationship_edges(
@@ -239,16 +335,26 @@ def create_relationship_edges(
 ) -> list[str]:
     """Create RELATED_TO_PERSON and RELATED_TO_EVENT edges. Returns errors."""
     errors = []
+    person_refs = []
+    event_refs = []
 
-    person_cols = [f"related person {i}" for i in range(1, 6)]
-    event_cols = [f"related event {i}" for i in range(1, 6)]
+    if not rows:
+        return errors
+
+    # All rows of a CSV share the same columns, so check them only once
+    person_cols = [
+        col for col in (f"related person {i}" for i in range(1, 6)) if col in rows[0]
+    ]
+    event_cols = [
+        col for col in (f"related event {i}" for i in range(1, 6)) if col in rows[0]
+    ]
 
     for row in rows:
         source_guid = row["guid"]
 
         # Person relationships
         for col in person_cols:
-            if col not in row or not row[col].strip():
+            if not row[col].strip():
                 continue
             name, _, _, description = parse_reference(row[col])
             if name not in person_lookup:
@@ -256,19 +362,17 @@ def create_relationship_edges(
                     f"{source_label} '{row.get('name', source_guid)}': unknown person '{name}'"
                 )
                 continue
-            tx.run(
-                f"""
-                MATCH (s:{source_label} {{guid: $source_guid}}), (t:Person {{name: $target_name}})
-                CREATE (s)-[:RELATED_TO_PERSON {{description: $description}}]->(t)
-                """,
-                source_guid=source_guid,
-                target_name=name,
-                description=description or "",
+            person_refs.append(
+                {
+                    "source_guid": source_guid,
+                    "target_guid": person_lookup[name],
+                    "description": description or "",
+                }
             )
 
         # Event relationships
         for col in event_cols:
-            if col not in row or not row[col].strip():
+            if not row[col].strip():
                 continue
             name, _, _, description = parse_reference(row[col])
             if name not in event_lookup:
@@ -276,19 +380,51 @@ def create_relationship_edges(
                     f"{source_label} '{row.get('name', source_guid)}': unknown event '{name}'"
                 )
                 continue
-            tx.run(
-                f"""
-                MATCH (s:{source_label} {{guid: $source_guid}}), (t:Event {{name: $target_name}})
-                CREATE (s)-[:RELATED_TO_EVENT {{description: $description}}]->(t)
-                """,
-                source_guid=source_guid,
-                target_name=name,
-                description=description or "",
+            event_refs.append(
+                {
+                    "source_guid": source_guid,
+                    "target_guid": event_lookup[name],
+                    "description": description or "",
+                }
             )
 
+    # Targets are matched by guid so the lookups use the uniqueness constraints
+    tx.run(
+        f"""
+        UNWIND $refs AS r
+        MATCH (s:{source_label} {{guid: r.source_guid}}), (t:Person {{guid: r.target_guid}})
+        CREATE (s)-[:RELATED_TO_PERSON {{description: r.description}}]->(t)
+        """,
+        refs=person_refs,
+    )
+    tx.run(
+        f"""
+        UNWIND $refs AS r
+        MATCH (s:{source_label} {{guid: r.source_guid}}), (t:Event {{guid: r.target_guid}})
+        CREATE (s)-[:RELATED_TO_EVENT {{description: r.description}}]->(t)
+        """,
+        refs=event_refs,
+    )
+
     return errors
 
 
+def execute_writes_concurrently(driver, bookmark_manager, work: list[tuple]):
+    """Run independent write transactions in parallel, one session per thread.
+
+    Each item of `work` is a transaction function followed by its arguments.
+    The driver is thread-safe but sessions are not, hence a session each.
+    """
+
+    def execute(item: tuple):
+        func, *args = item
+        with driver.session(bookmark_manager=bookmark_manager) as session:
+            return session.execute_write(func, *args)
+
+    with ThreadPoolExecutor(max_workers=len(work)) as executor:
+        return list(executor.map(execute, work))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Import CSV data into Neo4j AuraDB")
     parser.add_argument(
@@ -314,19 +450,22 @@ def main():
     data_dir = get_data_dir()
 
     # Load CSVs
-    persons = load_csv(data_dir / "person.csv")
-    events = load_csv(data_dir / "event.csv")
-    qas = load_csv(data_dir / "qa.csv")
-    clozes = load_csv(data_dir / "cloze.csv")
+    csv_names = ["person.csv", "event.csv", "qa.csv", "cloze.csv"]
+    with ThreadPoolExecutor(max_workers=len(csv_names)) as executor:
+        persons, events, qas, clozes = executor.map(
+            load_csv, (data_dir / name for name in csv_names)
+        )
 
     # Lookups for relationship resolution
-    person_lookup: dict[str, str] = {}
-    event_lookup: dict[str, str] = {}
+    person_lookup = {row["name"]: row["guid"] for row in persons}
+    event_lookup = {row["name"]: row["guid"] for row in events}
 
     # Connect to Neo4j AuraDB
     driver = GraphDatabase.driver(uri, auth=(username, password))
+    # Shared so every session sees the writes of the ones before it
+    bookmark_manager = GraphDatabase.bookmark_manager()
 
-    with driver.session() as session:
+    with driver.session(bookmark_manager=bookmark_manager) as session:
         if args.drop:
             print("Dropping all constraints and indexes...")
             session.execute_write(drop_all)
@@ -337,12 +476,21 @@ def main():
         print("Creating constraints...")
         session.execute_write(create_constraints)
 
+        print("Creating indexes...")
+        session.execute_write(create_indexes)
+
         print("Creating nodes...")
-        session.execute_write(create_persons, persons, person_lookup)
-        session.execute_write(create_events, events, event_lookup)
-        session.execute_write(create_qas, qas)
-        session.execute_write(create_clozes, clozes)
-        session.execute_write(create_tags, persons + events + qas + clozes)
+        execute_writes_concurrently(
+            driver,
+            bookmark_manager,
+            [
+                (create_persons, persons),
+                (create_events, events),
+                (create_qas, qas),
+                (create_clozes, clozes),
+                (create_tags, persons + events + qas + clozes),
+            ],
+        )
 
         print("Creating edges...")
         session.execute_write(create_tag_edges, persons, "Person")
@@ -3,155 +3,215 @@
 
 import argparse
 import csv
-import html
-import re
+import heapq
+import sys
 from collections import defaultdict
-from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from rapidfuzz import fuzz, process
+
 from model import Cloze, Event, Note, Person, QA, Relationship
-from utils import parse_reference
+from utils import parse_reference, strip_html
 
 
 class RelationshipAnalyzer:
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
         self.notes: dict[str, Note] = {}
-        self.incoming_relationships: dict[str, list[tuple[Note, Relationship]]] = (
-            defaultdict(list)
-        )
+        # Person/event name -> note, for resolving relationship targets
+        self.name_to_note: dict[str, Note] = {}
+        # Lower-cased display name -> notes, for exact-match searches
+        self.display_name_index: dict[str, list[Note]] = defaultdict(list)
+        # All notes and their lower-cased display names, aligned for searching
+        self.note_list: list[Note] = []
+        self.display_names_lower: list[str] = []
 
     def load_notes_from_csv(
         self, csv_path: Path, note_class: type[Note], field_mapping: dict[str, str]
     ):
         """Load notes from a CSV file."""
+        self.add_notes(self.read_notes_from_csv(csv_path, note_class, field_mapping))
+
+    def read_notes_from_csv(
+        self, csv_path: Path, note_class: type[Note], field_mapping: dict[str, str]
+    ) -> dict[str, Note]:
+        """Read notes from a CSV file without adding them to the analyzer."""
+        notes: dict[str, Note] = {}
         if not csv_path.exists():
-            return
+            return notes
+
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return notes
+
+            # Resolve columns to indices once instead of per row
+            guid_idx = header.index("guid")
+            field_idx = [
+                (header.index(csv_field), note_field)
+                for csv_field, note_field in field_mapping.items()
+                if csv_field in header
+            ]
+
+            # Relationship columns (exclude "personal related *" fields)
+            person_idx = []
+            event_idx = []
+            for i, column in enumerate(header):
+                column = column.lower()
+                if "personal" in column:
+                    continue
+                if "related person" in column:
+                    person_idx.append(i)
+                elif "related event" in column:
+                    event_idx.append(i)
 
-        with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                guid = row["guid"].strip()
+            for values in reader:
+                if not values:
+                    continue
+
+                guid = values[guid_idx].strip()
                 if not guid:
                     continue
 
                 # Create note instance
                 kwargs = {"guid": guid}
-                for csv_field, note_field in field_mapping.items():
-                    if csv_field in row:
-                        kwargs[note_field] = row[csv_field].strip()
+                for i, note_field in field_idx:
+                    kwargs[note_field] = values[i].strip()
 
                 note = note_class(**kwargs)
 
-                # Parse relationships (exclude "personal related *" fields)
-                for column, value in row.items():
-                    if not value or not value.strip():
+                # Parse relationships
+                for i in person_idx:
+                    if not (value := values[i].strip()):
                         continue
-
-                    if "personal" in column.lower():
-                        continue
-
-                    if "related person" in column.lower():
-                        name, _, _, description = parse_reference(value)
-                        if name:
-                            note.related_persons.append(
-                                Relationship(
-                                    target_name=name,
-                                    target_guid=None,
-                                    description=description,
-                                )
+                    name, _, _, description = parse_reference(value)
+                    if name:
+                        note.related_persons.append(
+                            Relationship(
+                                target_name=sys.intern(name),
+                                description=description or "",
+                                source_note=note,
                             )
-                    elif "related event" in column.lower():
-                        name, _, _, description = parse_reference(value)
-                        if name:
-                            note.related_events.append(
-                                Relationship(
-                                    target_name=name,
-                                    target_guid=None,
-                                    description=description,
-                                )
+                        )
+                for i in event_idx:
+                    if not (value := values[i].strip()):
+                        continue
+                    name, _, _, description = parse_reference(value)
+                    if name:
+                        note.related_events.append(
+                            Relationship(
+                                target_name=sys.intern(name),
+                                description=description or "",
+                                source_note=note,
                             )
+                        )
 
-                self.notes[guid] = note
+                notes[guid] = note
 
-    def load_all_notes(self):
-        """Load all note types from CSV files."""
-        self.load_notes_from_csv(
-            self.data_dir / "person.csv",
-            Person,
-            {"name": "name", "date of birth": "birth", "date of death": "death"},
-        )
+        return notes
 
-        self.load_notes_from_csv(
-            self.data_dir / "event.csv",
-            Event,
-            {"name": "name", "start date": "start", "end date": "end"},
-        )
-
-        self.load_notes_from_csv(
-            self.data_dir / "qa.csv",
-            QA,
-            {"question": "question", "answer": "answer"},
-        )
+    def add_notes(self, notes: dict[str, Note]):
+        """Add notes read by read_notes_from_csv."""
+        self.notes.update(notes)
+        for note in notes.values():
+            if isinstance(note, (Person, Event)):
+                # Interned like target_name, so lookups match by identity
+                self.name_to_note[sys.intern(note.get_display_name())] = note
 
-        self.load_notes_from_csv(
-            self.data_dir / "cloze.csv",
-            Cloze,
-            {"text": "text"},
-        )
+    def load_all_notes(self):
+        """Load all note types from CSV files."""
+        sources = [
+            (
+                self.data_dir / "person.csv",
+                Person,
+                {"name": "name", "date of birth": "birth", "date of death": "death"},
+            ),
+            (
+                self.data_dir / "event.csv",
+                Event,
+                {"name": "name", "start date": "start", "end date": "end"},
+            ),
+            (
+                self.data_dir / "qa.csv",
+                QA,
+                {"question": "question", "answer": "answer"},
+            ),
+            (
+                self.data_dir / "cloze.csv",
+                Cloze,
+                {"text": "text"},
+            ),
+        ]
+
+        # Read the files concurrently, then add them in order
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            results = list(
+                executor.map(lambda args: self.read_notes_from_csv(*args), sources)
+            )
+        for notes in results:
+            self.add_notes(notes)
 
     def resolve_relationship_guids(self):
-        """Resolve target names to GUIDs and build incoming relationship index."""
-        # Build name -> note mapping for quick lookup
-        name_to_note: dict[str, Note] = {}
-        for note in self.notes.values():
-            if isinstance(note, (Person, Event)):
-                name_to_note[note.get_display_name()] = note
-
-        # Resolve GUIDs and build incoming relationships
-        for source_note in self.notes.values():
-            for rel in source_note.get_all_outgoing_relationships():
-                # Try to find the target note by name
-                target_note = name_to_note.get(rel.target_name)
-                if target_note:
-                    rel.target_guid = target_note.guid
-                    # Add to incoming relationships
-                    self.incoming_relationships[target_note.guid].append(
-                        (source_note, rel)
-                    )
+        """Resolve target names to GUIDs and collect incoming relationships."""
+        name_to_note = self.name_to_note
+        self.note_list = list(self.notes.values())
+        self.display_names_lower = []
+        for source_note in self.note_list:
+            display_lower = source_note.get_display_name().lower()
+            self.display_names_lower.append(display_lower)
+            self.display_name_index[display_lower].append(source_note)
+
+            # Resolve GUIDs and build incoming relationships
+            for rels in (source_note.related_persons, source_note.related_events):
+                for rel in rels:
+                    # Try to find the target note by name
+                    target_note = name_to_note.get(rel.target_name)
+                    if target_note:
+                        rel.target_guid = target_note.guid
+                        rel.target_note = target_note
+                        # Add to incoming relationships
+                        target_note.incoming.append(rel)
 
     def fuzzy_search(self, search_str: str, threshold: float = 0.8) -> list[Note]:
-        """Fuzzy search notes by name/content."""
+        """Fuzzy search notes by name/content.
+
+        A search for an exact GUID or display name returns just that note.
+        """
         if not search_str:
             return list(self.notes.values())
 
-        matches = []
-        search_lower = search_str.lower()
-
-        for note in self.notes.values():
-            display_name = note.get_display_name().lower()
+        if search_str in self.notes:
+            return [self.notes[search_str]]
 
-            # Check for substring match first (always accept)
-            if search_lower in display_name:
-                matches.append(note)
-                continue
-
-            # Otherwise use fuzzy matching with threshold
-            ratio = SequenceMatcher(None, search_lower, display_name).ratio()
-            if ratio >= threshold:
-                matches.append(note)
+        search_lower = search_str.lower()
+        if search_lower in self.display_name_index:
+            return list(self.display_name_index[search_lower])
+
+        notes = self.note_list
+        display_names = self.display_names_lower
+
+        # Substring matches are always accepted
+        matched = {i for i, name in enumerate(display_names) if search_lower in name}
+
+        # Otherwise use fuzzy matching with threshold. Scoring the whole list
+        # in one rapidfuzz call keeps the loop in C, and with score_cutoff it
+        # skips names whose length alone rules out a match.
+        fuzzy_matches = process.extract(
+            search_lower,
+            display_names,
+            scorer=fuzz.ratio,
+            score_cutoff=threshold * 100,
+            limit=None,
+        )
+        matched.update(i for _, _, i in fuzzy_matches)
 
-        return matches
+        return [notes[i] for i in sorted(matched)]
 
     def strip_html(self, text: str) -> str:
         """Strip HTML tags from text but keep cloze markers."""
-        # Unescape HTML entities first
-        text = html.unescape(text)
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", text)
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        return strip_html(text)
 
     def truncate(self, text: str, max_length: int) -> str:
         """Truncate text to max_length with ellipsis."""
@@ -161,26 +221,17 @@ class RelationshipAnalyzer:
 
     def format_note_header(self, note: Note) -> str:
         """Format note header with type, name/content, GUID, and relationship count."""
-        display_name = note.get_display_name()
-
-        # Strip HTML for display
-        if isinstance(note, (Cloze, QA)):
-            display_name = self.strip_html(display_name)
-
-        display_name = self.truncate(display_name, 60)
+        display_name = self.truncate(note.display_for_print(), 60)
 
-        incoming_count = len(self.incoming_relationships.get(note.guid, []))
-        total = note.total_relationships(incoming_count)
+        total = note.total_relationships(len(note.incoming))
 
         return f"[{note.get_note_type()}] {display_name} ({note.guid}) - {total} relationships"
 
-    def format_relationship(self, rel: Relationship, target_note: Note | None) -> str:
+    def format_relationship(self, rel: Relationship) -> str:
         """Format a single relationship."""
+        target_note = rel.target_note
         if target_note:
-            display_name = target_note.get_display_name()
-            if isinstance(target_note, (Cloze, QA)):
-                display_name = self.strip_html(display_name)
-            display_name = self.truncate(display_name, 60)
+            display_name = self.truncate(target_note.display_for_print(), 60)
             note_type = target_note.get_note_type()
             result = f"[{note_type}] {display_name} ({rel.target_guid})"
         else:
@@ -201,56 +252,52 @@ class RelationshipAnalyzer:
     ):
         """Print notes and their relationships sorted by relationship count."""
 
+        sign = -1 if sort_order == "desc" else 1
+
         # Sort by relationship count, then alphabetically
         def sort_key(note: Note) -> tuple[int, str]:
-            incoming_count = len(self.incoming_relationships.get(note.guid, []))
-            total = note.total_relationships(incoming_count)
-            display_name = note.get_display_name()
-            if isinstance(note, (Cloze, QA)):
-                display_name = self.strip_html(display_name)
-
-            if sort_order == "desc":
-                return (-total, display_name)
-            else:
-                return (total, display_name)
-
-        sorted_notes = sorted(notes, key=sort_key)
+            total = note.total_relationships(len(note.incoming))
+            return (sign * total, note.display_for_print())
 
         if max_display:
-            sorted_notes = sorted_notes[:max_display]
+            # Same result as sorting everything and slicing
+            sorted_notes = heapq.nsmallest(max_display, notes, key=sort_key)
+        else:
+            sorted_notes = sorted(notes, key=sort_key)
 
+        # Collect all lines and write them in one go
+        out = []
         for note in sorted_notes:
-            print(self.format_note_header(note))
+            out.append(self.format_note_header(note))
 
             # Outgoing relationships
             outgoing = note.get_all_outgoing_relationships()
             if outgoing:
-                print(f"  Outgoing ({len(outgoing)}):")
+                out.append(f"  Outgoing ({len(outgoing)}):")
                 for rel in outgoing:
-                    target_note = (
-                        self.notes.get(rel.target_guid) if rel.target_guid else None
-                    )
-                    print(f"    → {self.format_relationship(rel, target_note)}")
+                    out.append(f"    → {self.format_relationship(rel)}")
 
             # Incoming relationships
-            incoming = self.incoming_relationships.get(note.guid, [])
+            incoming = note.incoming
             if incoming:
-                print(f"  Incoming ({len(incoming)}):")
-                for source_note, rel in incoming:
-                    source_display = source_note.get_display_name()
-                    if isinstance(source_note, (Cloze, QA)):
-                        source_display = self.strip_html(source_display)
-                    source_display = self.truncate(source_display, 60)
+                out.append(f"  Incoming ({len(incoming)}):")
+                for rel in incoming:
+                    source_note = rel.source_note
+                    source_display = self.truncate(source_note.display_for_print(), 60)
                     rel_desc = (
                         f": {self.truncate(rel.description, 80)}"
                         if rel.description
                         else ""
                     )
-                    print(
+                    out.append(
                         f"    ← [{source_note.get_note_type()}] {source_display} ({source_note.guid}){rel_desc}"
                     )
 
-            print()
+            out.append("")
+
+        if out:
+            out.append("")
+            sys.stdout.write("\n".join(out))
 
 
 def main():
@@ -264,7 +311,10 @@ def main():
         help="Sort order by relationship count (default: desc)",
     )
     parser.add_argument(
-        "--search", type=str, help="Fuzzy search string to filter notes"
+        "--search",
+        type=str,
+        help="Fuzzy search string to filter notes (an exact name or GUID "
+        "selects only that note)",
     )
     parser.add_argument(
         "--threshold",
@@ -4,23 +4,37 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional
 
+from utils import strip_html
 
-@dataclass
+
+@dataclass(slots=True)
 class Relationship:
     """A relationship to another note."""
 
     target_name: str
-    target_guid: Optional[str]
-    description: Optional[str]
+    # "" when unresolved or absent
+    target_guid: str = ""
+    description: str = ""
+    # Note the relationship belongs to
+    source_note: Optional["Note"] = field(default=None, repr=False, compare=False)
+    # Resolved target, set alongside target_guid
+    target_note: Optional["Note"] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class Note(ABC):
     """Base class for all note types."""
 
     guid: str
     related_persons: list[Relationship] = field(default_factory=list)
     related_events: list[Relationship] = field(default_factory=list)
+    # Relationships of other notes pointing at this note
+    incoming: list[Relationship] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _outgoing: Optional[list[Relationship]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @abstractmethod
     def get_display_name(self) -> str:
@@ -32,16 +46,26 @@ class Note(ABC):
         """Get the note type name (Person, Event, QA, Cloze)."""
         pass
 
+    def display_for_print(self) -> str:
+        """Get the display name as plain text."""
+        return self.get_display_name()
+
     def get_all_outgoing_relationships(self) -> list[Relationship]:
-        """Get all outgoing relationships (persons + events)."""
-        return self.related_persons + self.related_events
+        """Get all outgoing relationships (persons + events).
+
+        The combined list is built on first use, so relationships must not be
+        added after that (they are only added while loading).
+        """
+        if self._outgoing is None:
+            self._outgoing = self.related_persons + self.related_events
+        return self._outgoing
 
     def total_relationships(self, incoming_count: int) -> int:
         """Get total relationship count (outgoing + incoming)."""
-        return len(self.get_all_outgoing_relationships()) + incoming_count
+        return len(self.related_persons) + len(self.related_events) + incoming_count
 
 
-@dataclass
+@dataclass(slots=True)
 class Person(Note):
     """A Person note."""
 
@@ -56,7 +80,7 @@ class Person(Note):
         return "Person"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event(Note):
     """An Event note."""
 
@@ -71,7 +95,7 @@ class Event(Note):
         return "Event"
 
 
-@dataclass
+@dataclass(slots=True)
 class QA(Note):
     """A QA (Question-Answer) note."""
 
@@ -81,11 +105,14 @@ class QA(Note):
     def get_display_name(self) -> str:
         return self.question
 
+    def display_for_print(self) -> str:
+        return strip_html(self.question)
+
     def get_note_type(self) -> str:
         return "QA"
 
 
-@dataclass
+@dataclass(slots=True)
 class Cloze(Note):
     """A Cloze deletion note."""
 
@@ -94,5 +121,8 @@ class Cloze(Note):
     def get_display_name(self) -> str:
         return self.text
 
+    def display_for_print(self) -> str:
+        return strip_html(self.text)
+
     def get_note_type(self) -> str:
         return "Cloze"
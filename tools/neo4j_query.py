@@ -11,16 +11,25 @@ This script provides a CLI for the Neo4j graph database to:
 """
 
 import argparse
+import atexit
+import hashlib
+import io
+import json
 import os
 import re
+import secrets
+import shlex
 import sys
-import uuid
-from typing import Optional
+import time
+from contextlib import nullcontext, redirect_stdout
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
-
-load_dotenv()
+# neo4j and dotenv are imported when the driver is first needed, so --help
+# and argument errors don't pay for loading them
+if TYPE_CHECKING:
+    from neo4j import Record
 
 
 def parse_date(date_str: str) -> tuple[int | None, bool | None]:
@@ -84,8 +93,24 @@ def format_date(year: int | None, approximate: bool | None) -> str:
     return year_str
 
 
+# Table headers of the query commands
+TAGS_HEADER = f"{'Tag':<50} {'Count':>6}\n{'-' * 58}"
+ENTITIES_HEADER = f"{'Name':<60} {'Dates':<20}\n{'-' * 82}"
+SEARCH_HEADER = f"{'Type':<8} {'Name':<55} {'Dates':<20}\n{'-' * 85}"
+RELATED_HEADER = f"{'Type':<8} {'Name':<45} {'Dates':<15} {'Tags'}\n{'-' * 100}"
+
+
+@cache
 def get_driver():
-    """Get Neo4j driver from environment variables."""
+    """Get the Neo4j driver from environment variables, created once per process.
+
+    Connection pool settings can be tuned with NEO4J_MAX_POOL_SIZE,
+    NEO4J_ACQUISITION_TIMEOUT and NEO4J_MAX_CONNECTION_LIFETIME (seconds).
+    """
+    from dotenv import load_dotenv
+    from neo4j import GraphDatabase
+
+    load_dotenv()
     uri = os.environ.get("NEO4J_URI")
     username = os.environ.get("NEO4J_USERNAME", "neo4j")
     password = os.environ.get("NEO4J_PASSWORD")
@@ -97,34 +122,57 @@ def get_driver():
         )
         sys.exit(1)
 
-    return GraphDatabase.driver(uri, auth=(username, password))
+    driver = GraphDatabase.driver(
+        uri,
+        auth=(username, password),
+        max_connection_pool_size=int(os.environ.get("NEO4J_MAX_POOL_SIZE", "100")),
+        connection_acquisition_timeout=float(
+            os.environ.get("NEO4J_ACQUISITION_TIMEOUT", "60")
+        ),
+        max_connection_lifetime=float(
+            os.environ.get("NEO4J_MAX_CONNECTION_LIFETIME", "3600")
+        ),
+        keep_alive=True,
+    )
+    # Closed when the process exits, so callers can keep reusing it
+    atexit.register(driver.close)
+    return driver
 
 
-def list_tags(driver, limit: int = 100):
-    """List all tags in the database."""
-    with driver.session() as session:
-        result = session.run(
-            """
-            MATCH (t:Tag)<-[:HAS_TAG]-(n)
-            RETURN t.name AS tag, count(n) AS count
-            ORDER BY count DESC, tag
-            LIMIT $limit
-            """,
-            limit=limit,
-        )
-        tags = result.data()
+def collect_records(tx, cypher: str, **params) -> list["Record"]:
+    """Run a query and return all its rows.
+
+    Commands print only after the transaction returns, since a managed
+    transaction is retried from the start on transient errors.
+    """
+    return list(tx.run(cypher, **params))
+
 
+def list_tags(session, limit: int = 100):
+    """List all tags in the database."""
+    # Count by relationship degree rather than expanding every HAS_TAG
+    tags = session.execute_read(
+        collect_records,
+        """
+        MATCH (t:Tag)
+        WITH t.name AS tag, COUNT { (t)<-[:HAS_TAG]-() } AS count
+        WHERE count > 0
+        RETURN tag, count
+        ORDER BY count DESC, tag
+        LIMIT $limit
+        """,
+        limit=limit,
+    )
     if not tags:
         print("No tags found.")
         return
 
-    print(f"{'Tag':<50} {'Count':>6}")
-    print("-" * 58)
+    print(TAGS_HEADER)
     for t in tags:
         print(f"{t['tag']:<50} {t['count']:>6}")
 
 
-def list_entities(driver, entity_type: str, limit: int = 50):
+def list_entities(session, entity_type: str, limit: int = 50):
     """List entities of a given type."""
     label = entity_type.capitalize()
     if label not in ("Person", "Event", "Qa", "Cloze"):
@@ -134,64 +182,49 @@ def list_entities(driver, entity_type: str, limit: int = 50):
             print(f"Unknown entity type: {entity_type}", file=sys.stderr)
             sys.exit(1)
 
-    with driver.session() as session:
-        if label == "Person":
-            result = session.run(
-                f"""
-                MATCH (n:{label})
-                RETURN n.name AS name,
-                       n.birth_year AS start_year, n.birth_approximate AS start_approx,
-                       n.death_year AS end_year, n.death_approximate AS end_approx
-                ORDER BY n.name
-                LIMIT $limit
-                """,
-                limit=limit,
-            )
-        elif label == "Event":
-            result = session.run(
-                f"""
-                MATCH (n:{label})
-                RETURN n.name AS name,
-                       n.start_year AS start_year, n.start_approximate AS start_approx,
-                       n.end_year AS end_year, n.end_approximate AS end_approx
-                ORDER BY n.name
-                LIMIT $limit
-                """,
-                limit=limit,
-            )
-        elif label == "QA":
-            result = session.run(
-                f"""
-                MATCH (n:{label})
-                RETURN n.question AS name,
-                       null AS start_year, null AS start_approx,
-                       null AS end_year, null AS end_approx
-                ORDER BY n.question
-                LIMIT $limit
-                """,
-                limit=limit,
-            )
-        else:  # Cloze
-            result = session.run(
-                f"""
-                MATCH (n:{label})
-                RETURN n.text AS name,
-                       null AS start_year, null AS start_approx,
-                       null AS end_year, null AS end_approx
-                ORDER BY n.text
-                LIMIT $limit
-                """,
-                limit=limit,
-            )
-
-        entities = result.data()
+    if label == "Person":
+        cypher = f"""
+            MATCH (n:{label})
+            RETURN n.name AS name,
+                   n.birth_year AS start_year, n.birth_approximate AS start_approx,
+                   n.death_year AS end_year, n.death_approximate AS end_approx
+            ORDER BY n.name
+            LIMIT $limit
+            """
+    elif label == "Event":
+        cypher = f"""
+            MATCH (n:{label})
+            RETURN n.name AS name,
+                   n.start_year AS start_year, n.start_approximate AS start_approx,
+                   n.end_year AS end_year, n.end_approximate AS end_approx
+            ORDER BY n.name
+            LIMIT $limit
+            """
+    elif label == "QA":
+        cypher = f"""
+            MATCH (n:{label})
+            RETURN n.question AS name,
+                   null AS start_year, null AS start_approx,
+                   null AS end_year, null AS end_approx
+            ORDER BY n.question
+            LIMIT $limit
+            """
+    else:  # Cloze
+        cypher = f"""
+            MATCH (n:{label})
+            RETURN n.text AS name,
+                   null AS start_year, null AS start_approx,
+                   null AS end_year, null AS end_approx
+            ORDER BY n.text
+            LIMIT $limit
+            """
 
+    entities = session.execute_read(collect_records, cypher, limit=limit)
     if not entities:
         print(f"No {label}s found.")
         return
 
-    print(f"{'Name':<60} {'Dates':<20}")
-    print("-" * 82)
+    print(ENTITIES_HEADER)
     for e in entities:
         name = (e["name"] or "")[:58]
         start = format_date(e["start_year"], e["start_approx"])
@@ -205,39 +238,95 @@ def list_entities(driver, entity_type: str, limit: int = 50):
         print(f"{name:<60} {dates:<20}")
 
 
-def search_entities(driver, search_term: str, limit: int = 20):
-    """Search for entities by name (case-insensitive contains)."""
-    with driver.session() as session:
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event OR n:QA OR n:Cloze)
-              AND (toLower(n.name) CONTAINS toLower($search_term)
-                   OR toLower(n.question) CONTAINS toLower($search_term)
-                   OR toLower(n.text) CONTAINS toLower($search_term))
-            RETURN
-                labels(n)[0] AS type,
-                coalesce(n.name, n.question, n.text) AS name,
-                n.guid AS guid,
-                coalesce(n.birth_year, n.start_year) AS start_year,
-                coalesce(n.birth_approximate, n.start_approximate) AS start_approx,
-                coalesce(n.death_year, n.end_year) AS end_year,
-                coalesce(n.death_approximate, n.end_approximate) AS end_approx
-            ORDER BY name
-            LIMIT $limit
-            """,
-            search_term=search_term,
-            limit=limit,
+# Matches the entity (Person, Event, QA, or Cloze) named $name_lower as n.
+# One MATCH per label, so each branch can use that label's index instead of
+# scanning all nodes.
+ENTITY_BY_NAME_MATCH = """
+CALL {
+    MATCH (n:Person) WHERE n.name_lower = $name_lower RETURN n
+    UNION
+    MATCH (n:Event) WHERE n.name_lower = $name_lower RETURN n
+    UNION
+    MATCH (n:QA) WHERE n.question_lower = $name_lower RETURN n
+    UNION
+    MATCH (n:Cloze) WHERE n.text_lower = $name_lower RETURN n
+}
+"""
+# The same for the Person or Event named $name_lower
+PERSON_OR_EVENT_BY_NAME_MATCH = """
+CALL {
+    MATCH (n:Person) WHERE n.name_lower = $name_lower RETURN n
+    UNION
+    MATCH (n:Event) WHERE n.name_lower = $name_lower RETURN n
+}
+"""
+
+
+# Indexes csv_to_neo4j.py creates together with the lower-cased properties
+LOWER_PROPERTY_INDEXES = (
+    "person_name_lower",
+    "event_name_lower",
+    "qa_question_lower",
+    "cloze_text_lower",
+)
+
+
+@cache
+def lower_properties_imported() -> bool:
+    """Check once per process whether the lower-cased properties were imported.
+
+    csv_to_neo4j.py drops and recreates all indexes on every import, so their
+    indexes only exist if it also set the properties. This avoids scanning
+    every node for a missing property.
+    """
+    with get_driver().session() as session:
+        indexes = session.execute_read(
+            collect_records,
+            "SHOW INDEXES YIELD name WHERE name IN $names RETURN name",
+            names=list(LOWER_PROPERTY_INDEXES),
         )
-        entities = result.data()
+    return len(indexes) == len(LOWER_PROPERTY_INDEXES)
 
-    if not entities:
+
+def check_lower_properties():
+    """Exit if nodes may lack the lower-cased properties that lookups match on.
+
+    name_lower, question_lower and text_lower are set by csv_to_neo4j.py.
+    On a database imported before they existed, every lookup would miss
+    and creating an entity would duplicate it.
+    """
+    if not lower_properties_imported():
+        print(
+            "Error: Some nodes lack name_lower, question_lower or text_lower. "
+            "Re-run tools/csv_to_neo4j.py to re-import the data.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+# Full-text index over entity names, created by csv_to_neo4j.py
+ENTITY_SEARCH_INDEX = "entity_search"
+# Words as the index's analyzer splits them, e.g. "Franco-Prussian" into
+# "franco" and "prussian". Prefix terms are not analyzed, so they have to be
+# split the same way to match, and contain no Lucene special characters.
+SEARCH_WORD_RE = re.compile(r"\w+")
+
+
+def fulltext_query(search_term: str) -> str:
+    """Build a Lucene query matching entities with words starting with each word."""
+    return " AND ".join(
+        word + "*" for word in SEARCH_WORD_RE.findall(search_term.lower())
+    )
+
+
+def print_search_results(search_term: str, results: list["Record"]):
+    """Print the rows of a search query."""
+    if not results:
         print(f"No entities found matching '{search_term}'.")
         return
 
-    print(f"{'Type':<8} {'Name':<55} {'Dates':<20}")
-    print("-" * 85)
-    for e in entities:
+    print(SEARCH_HEADER)
+    for e in results:
         name = (e["name"] or "")[:53]
         start = format_date(e["start_year"], e["start_approx"])
         end = format_date(e["end_year"], e["end_approx"])
@@ -250,193 +339,227 @@ def search_entities(driver, search_term: str, limit: int = 20):
         print(f"{e['type']:<8} {name:<55} {dates:<20}")
 
 
-def show_entity(driver, name: str):
-    """Show all properties of an entity by name."""
-    with driver.session() as session:
-        # Find the entity (Person, Event, QA, or Cloze)
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event OR n:QA OR n:Cloze)
-              AND (toLower(n.name) = toLower($name)
-                   OR toLower(n.question) = toLower($name)
-                   OR toLower(n.text) = toLower($name))
-            RETURN n, labels(n)[0] AS type
-            LIMIT 1
-            """,
-            name=name,
-        )
-        record = result.single()
-
-        if not record:
-            print(f"Entity '{name}' not found.", file=sys.stderr)
-            return
-
-        node = record["n"]
-        entity_type = record["type"]
-
-        # Get tags
-        result = session.run(
-            """
-            MATCH (n)-[:HAS_TAG]->(t:Tag)
-            WHERE (n:Person OR n:Event OR n:QA OR n:Cloze)
-              AND (toLower(n.name) = toLower($name)
-                   OR toLower(n.question) = toLower($name)
-                   OR toLower(n.text) = toLower($name))
-            RETURN t.name AS tag
-            ORDER BY tag
-            """,
-            name=name,
-        )
-        tags = [r["tag"] for r in result.data()]
+def search_entities(session, search_term: str, limit: int = 20, lucene: bool = False):
+    """Search for entities by name, using the full-text index if available.
 
-        print(
-            f"\n{entity_type}: {node.get('name') or node.get('question') or node.get('text')}"
-        )
-        print(f"  GUID: {node.get('guid', 'N/A')}")
-
-        if entity_type == "Person":
-            birth = format_date(node.get("birth_year"), node.get("birth_approximate"))
-            death = format_date(node.get("death_year"), node.get("death_approximate"))
-            print(f"  Birth: {birth or 'N/A'}")
-            print(f"  Death: {death or 'N/A'}")
-            print(f"  Known for: {node.get('known_for') or 'N/A'}")
-            if node.get("picture"):
-                print(f"  Picture: {node.get('picture')}")
-        elif entity_type == "Event":
-            start = format_date(node.get("start_year"), node.get("start_approximate"))
-            end = format_date(node.get("end_year"), node.get("end_approximate"))
-            print(f"  Start: {start or 'N/A'}")
-            print(f"  End: {end or 'N/A'}")
-            print(f"  Summary: {node.get('summary') or 'N/A'}")
-        elif entity_type == "QA":
-            print(f"  Question: {node.get('question') or 'N/A'}")
-            print(f"  Answer: {node.get('answer') or 'N/A'}")
-        elif entity_type == "Cloze":
-            print(f"  Text: {node.get('text') or 'N/A'}")
-
-        print(f"  Notes: {node.get('notes') or 'N/A'}")
-        print(f"  Source: {node.get('source_license') or 'N/A'}")
-        print(f"  Tags: {', '.join(tags) if tags else 'None'}")
-
-
-def get_relationships(driver, name: str):
-    """Get all relationships for an entity by name."""
-    with driver.session() as session:
-        # Find the entity
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event)
-              AND toLower(n.name) = toLower($name)
-            RETURN n, labels(n)[0] AS type
-            LIMIT 1
-            """,
-            name=name,
-        )
-        record = result.single()
-
-        if not record:
-            print(f"Entity '{name}' not found.", file=sys.stderr)
-            return
+    With lucene, the search term is passed to the index as a Lucene query,
+    e.g. "napoleon~" for a fuzzy match.
+    """
+    from neo4j.exceptions import ClientError
 
-        node = record["n"]
-        entity_type = record["type"]
-        print(f"\n{entity_type}: {node['name']}")
-        if entity_type == "Person":
-            birth = format_date(node.get("birth_year"), node.get("birth_approximate"))
-            death = format_date(node.get("death_year"), node.get("death_approximate"))
-            print(f"  Birth: {birth or 'N/A'}, Death: {death or 'N/A'}")
+    query = search_term if lucene else fulltext_query(search_term)
+    if query:
+        try:
+            results = session.execute_read(
+                collect_records,
+                """
+                CALL db.index.fulltext.queryNodes($index, $query)
+                YIELD node AS n, score
+                RETURN
+                    labels(n)[0] AS type,
+                    coalesce(n.name, n.question, n.text) AS name,
+                    n.guid AS guid,
+                    coalesce(n.birth_year, n.start_year) AS start_year,
+                    coalesce(n.birth_approximate, n.start_approximate) AS start_approx,
+                    coalesce(n.death_year, n.end_year) AS end_year,
+                    coalesce(n.death_approximate, n.end_approximate) AS end_approx
+                ORDER BY score DESC, name
+                LIMIT $limit
+                """,
+                index=ENTITY_SEARCH_INDEX,
+                query=query,
+                limit=limit,
+            )
+        except ClientError as e:
+            if lucene:
+                print(f"Error: Full-text search failed. {e.message}", file=sys.stderr)
+                sys.exit(1)
+            # Index missing, e.g. data imported before it was added
         else:
-            start = format_date(node.get("start_year"), node.get("start_approximate"))
-            end = format_date(node.get("end_year"), node.get("end_approximate"))
-            print(f"  Start: {start or 'N/A'}, End: {end or 'N/A'}")
+            # Without hits, the scan below still finds the term in the middle
+            # of a word, like the search did before the index existed
+            if results or lucene:
+                print_search_results(search_term, results)
+                return
+
+    # Fall back to a case-insensitive contains scan
+    results = session.execute_read(
+        collect_records,
+        """
+        CALL {
+            MATCH (n:Person) WHERE n.name_lower CONTAINS $search_lower RETURN n
+            UNION ALL
+            MATCH (n:Event) WHERE n.name_lower CONTAINS $search_lower RETURN n
+            UNION ALL
+            MATCH (n:QA) WHERE n.question_lower CONTAINS $search_lower RETURN n
+            UNION ALL
+            MATCH (n:Cloze) WHERE n.text_lower CONTAINS $search_lower RETURN n
+        }
+        RETURN
+            labels(n)[0] AS type,
+            coalesce(n.name, n.question, n.text) AS name,
+            n.guid AS guid,
+            coalesce(n.birth_year, n.start_year) AS start_year,
+            coalesce(n.birth_approximate, n.start_approximate) AS start_approx,
+            coalesce(n.death_year, n.end_year) AS end_year,
+            coalesce(n.death_approximate, n.end_approximate) AS end_approx
+        ORDER BY name
+        LIMIT $limit
+        """,
+        search_lower=search_term.lower(),
+        limit=limit,
+    )
+    print_search_results(search_term, results)
 
-        # Get outgoing relationships to persons
-        result = session.run(
-            """
-            MATCH (n)-[r:RELATED_TO_PERSON]->(p:Person)
-            WHERE toLower(n.name) = toLower($name)
-            RETURN p.name AS target, r.description AS description,
-                   p.birth_year AS start_year, p.birth_approximate AS start_approx,
-                   p.death_year AS end_year, p.death_approximate AS end_approx
-            ORDER BY p.name
-            """,
-            name=name,
-        )
-        persons = result.data()
 
-        # Get outgoing relationships to events
-        result = session.run(
-            """
-            MATCH (n)-[r:RELATED_TO_EVENT]->(e:Event)
-            WHERE toLower(n.name) = toLower($name)
-            RETURN e.name AS target, r.description AS description,
-                   e.start_year AS start_year, e.start_approximate AS start_approx,
-                   e.end_year AS end_year, e.end_approximate AS end_approx
-            ORDER BY e.name
-            """,
-            name=name,
-        )
-        events = result.data()
+def show_entity(session, name: str):
+    """Show all properties of an entity by name."""
+    # Find the entity (Person, Event, QA, or Cloze) together with its tags
+    records = session.execute_read(
+        collect_records,
+        ENTITY_BY_NAME_MATCH
+        + """
+        WITH n LIMIT 1
+        RETURN n, labels(n)[0] AS type,
+            COLLECT {
+                MATCH (n)-[:HAS_TAG]->(t:Tag)
+                RETURN t.name AS tag
+                ORDER BY tag
+            } AS tags
+        """,
+        name_lower=name.lower(),
+    )
+    if not records:
+        check_lower_properties()
+        print(f"Error: Entity '{name}' not found.", file=sys.stderr)
+        sys.exit(1)
 
-        # Get incoming relationships from other entities
-        result = session.run(
-            """
-            MATCH (other)-[r]->(n)
-            WHERE toLower(n.name) = toLower($name)
-              AND type(r) IN ['RELATED_TO_PERSON', 'RELATED_TO_EVENT']
-            RETURN labels(other)[0] AS type,
-                   coalesce(other.name, other.question, other.text) AS source,
-                   r.description AS description
-            ORDER BY source
-            """,
-            name=name,
-        )
-        incoming = result.data()
+    record = records[0]
+    node = record["n"]
+    entity_type = record["type"]
+    tags = record["tags"]
 
-        # Get tags
-        result = session.run(
-            """
-            MATCH (n)-[:HAS_TAG]->(t:Tag)
-            WHERE toLower(n.name) = toLower($name)
-            RETURN t.name AS tag
-            ORDER BY tag
-            """,
-            name=name,
-        )
-        tags = [r["tag"] for r in result.data()]
-
-        print(f"\nTags: {', '.join(tags) if tags else 'None'}")
-
-        if persons:
-            print(f"\nRelated Persons ({len(persons)}):")
-            for p in persons:
-                start = format_date(p["start_year"], p["start_approx"])
-                end = format_date(p["end_year"], p["end_approx"])
-                dates = f" ({start}–{end})" if start else ""
-                desc = f": {p['description']}" if p["description"] else ""
-                print(f"  → {p['target']}{dates}{desc}")
-
-        if events:
-            print(f"\nRelated Events ({len(events)}):")
-            for e in events:
-                start = format_date(e["start_year"], e["start_approx"])
-                end = format_date(e["end_year"], e["end_approx"])
-                dates = f" ({start}–{end})" if start else ""
-                desc = f": {e['description']}" if e["description"] else ""
-                print(f"  → {e['target']}{dates}{desc}")
-
-        if incoming:
-            print(f"\nReferenced By ({len(incoming)}):")
-            for i in incoming:
-                desc = f": {i['description']}" if i["description"] else ""
-                source = (i["source"] or "")[:60]
-                print(f"  ← [{i['type']}] {source}{desc}")
+    print(
+        f"\n{entity_type}: {node.get('name') or node.get('question') or node.get('text')}"
+    )
+    print(f"  GUID: {node.get('guid', 'N/A')}")
+
+    if entity_type == "Person":
+        birth = format_date(node.get("birth_year"), node.get("birth_approximate"))
+        death = format_date(node.get("death_year"), node.get("death_approximate"))
+        print(f"  Birth: {birth or 'N/A'}")
+        print(f"  Death: {death or 'N/A'}")
+        print(f"  Known for: {node.get('known_for') or 'N/A'}")
+        if node.get("picture"):
+            print(f"  Picture: {node.get('picture')}")
+    elif entity_type == "Event":
+        start = format_date(node.get("start_year"), node.get("start_approximate"))
+        end = format_date(node.get("end_year"), node.get("end_approximate"))
+        print(f"  Start: {start or 'N/A'}")
+        print(f"  End: {end or 'N/A'}")
+        print(f"  Summary: {node.get('summary') or 'N/A'}")
+    elif entity_type == "QA":
+        print(f"  Question: {node.get('question') or 'N/A'}")
+        print(f"  Answer: {node.get('answer') or 'N/A'}")
+    elif entity_type == "Cloze":
+        print(f"  Text: {node.get('text') or 'N/A'}")
+
+    print(f"  Notes: {node.get('notes') or 'N/A'}")
+    print(f"  Source: {node.get('source_license') or 'N/A'}")
+    print(f"  Tags: {', '.join(tags) if tags else 'None'}")
+
+
+def get_relationships(session, name: str):
+    """Get all relationships for an entity by name."""
+    # Find the entity together with its relationships and tags
+    records = session.execute_read(
+        collect_records,
+        PERSON_OR_EVENT_BY_NAME_MATCH
+        + """
+        WITH n LIMIT 1
+        RETURN n, labels(n)[0] AS type,
+            COLLECT {
+                MATCH (n)-[r:RELATED_TO_PERSON]->(p:Person)
+                RETURN {target: p.name, description: r.description,
+                        start_year: p.birth_year, start_approx: p.birth_approximate,
+                        end_year: p.death_year, end_approx: p.death_approximate} AS rel
+                ORDER BY rel.target
+            } AS persons,
+            COLLECT {
+                MATCH (n)-[r:RELATED_TO_EVENT]->(e:Event)
+                RETURN {target: e.name, description: r.description,
+                        start_year: e.start_year, start_approx: e.start_approximate,
+                        end_year: e.end_year, end_approx: e.end_approximate} AS rel
+                ORDER BY rel.target
+            } AS events,
+            COLLECT {
+                MATCH (other)-[r:RELATED_TO_PERSON|RELATED_TO_EVENT]->(n)
+                RETURN {type: labels(other)[0],
+                        source: coalesce(other.name, other.question, other.text),
+                        description: r.description} AS rel
+                ORDER BY rel.source
+            } AS incoming,
+            COLLECT {
+                MATCH (n)-[:HAS_TAG]->(t:Tag)
+                RETURN t.name AS tag
+                ORDER BY tag
+            } AS tags
+        """,
+        name_lower=name.lower(),
+    )
+    if not records:
+        check_lower_properties()
+        print(f"Error: Entity '{name}' not found.", file=sys.stderr)
+        sys.exit(1)
+
+    record = records[0]
+    node = record["n"]
+    entity_type = record["type"]
+    persons = record["persons"]
+    events = record["events"]
+    incoming = record["incoming"]
+    tags = record["tags"]
+
+    print(f"\n{entity_type}: {node['name']}")
+    if entity_type == "Person":
+        birth = format_date(node.get("birth_year"), node.get("birth_approximate"))
+        death = format_date(node.get("death_year"), node.get("death_approximate"))
+        print(f"  Birth: {birth or 'N/A'}, Death: {death or 'N/A'}")
+    else:
+        start = format_date(node.get("start_year"), node.get("start_approximate"))
+        end = format_date(node.get("end_year"), node.get("end_approximate"))
+        print(f"  Start: {start or 'N/A'}, End: {end or 'N/A'}")
+
+    print(f"\nTags: {', '.join(tags) if tags else 'None'}")
+
+    if persons:
+        print(f"\nRelated Persons ({len(persons)}):")
+        for p in persons:
+            start = format_date(p["start_year"], p["start_approx"])
+            end = format_date(p["end_year"], p["end_approx"])
+            dates = f" ({start}–{end})" if start else ""
+            desc = f": {p['description']}" if p["description"] else ""
+            print(f"  → {p['target']}{dates}{desc}")
+
+    if events:
+        print(f"\nRelated Events ({len(events)}):")
+        for e in events:
+            start = format_date(e["start_year"], e["start_approx"])
+            end = format_date(e["end_year"], e["end_approx"])
+            dates = f" ({start}–{end})" if start else ""
+            desc = f": {e['description']}" if e["description"] else ""
+            print(f"  → {e['target']}{dates}{desc}")
+
+    if incoming:
+        print(f"\nReferenced By ({len(incoming)}):")
+        for i in incoming:
+            desc = f": {i['description']}" if i["description"] else ""
+            source = (i["source"] or "")[:60]
+            print(f"  ← [{i['type']}] {source}{desc}")
 
 
 def find_related(
-    driver,
+    session,
     name: str,
     time_start: Optional[str],
     time_end: Optional[str],
@@ -444,75 +567,67 @@ def find_related(
     limit: int = 20,
 ):
     """Find potentially related entities based on time period and tags."""
-    with driver.session() as session:
-        # Build a query to find entities with overlapping time periods or matching tags
-        conditions = []
-        params: dict[str, int | None | list[str]] = {"limit": limit}
-
-        if time_start and time_end:
-            # Parse the input dates to get integer years
-            start_year, _ = parse_date(time_start)
-            end_year, _ = parse_date(time_end)
-            # Find entities whose time range overlaps
-            conditions.append(
-                """
-                (
-                    (n:Person AND n.birth_year IS NOT NULL AND n.death_year IS NOT NULL
-                     AND n.birth_year <= $time_end
-                     AND n.death_year >= $time_start)
-                    OR
-                    (n:Event AND n.start_year IS NOT NULL AND n.end_year IS NOT NULL
-                     AND n.start_year <= $time_end
-                     AND n.end_year >= $time_start)
-                )
-                """
-            )
-            params["time_start"] = start_year
-            params["time_end"] = end_year
-
-        if tags:
-            conditions.append(
-                """
-                EXISTS {
-                    MATCH (n)-[:HAS_TAG]->(t:Tag)
-                    WHERE t.name IN $tags
-                }
-                """
-            )
-            params["tags"] = tags
-
-        where_clause = " AND ".join(conditions) if conditions else "true"
-
-        result = session.run(
-            f"""
-            MATCH (n)
-            WHERE (n:Person OR n:Event)
-              AND n.name <> $name
-              AND {where_clause}
-            OPTIONAL MATCH (n)-[:HAS_TAG]->(t:Tag)
-            WITH n, labels(n)[0] AS type, collect(t.name) AS tags
-            RETURN type,
-                   n.name AS name,
-                   coalesce(n.birth_year, n.start_year) AS start_year,
-                   coalesce(n.birth_approximate, n.start_approximate) AS start_approx,
-                   coalesce(n.death_year, n.end_year) AS end_year,
-                   coalesce(n.death_approximate, n.end_approximate) AS end_approx,
-                   tags
-            ORDER BY start_year, name
-            LIMIT $limit
-            """,
-            name=name,
-            **params,
+    # One MATCH per label, so each branch scans only Person or Event nodes and
+    # can use that label's year indexes
+    person_conditions = ["n.name <> $name"]
+    event_conditions = ["n.name <> $name"]
+    params: dict[str, int | None | list[str]] = {"limit": limit}
+
+    if time_start and time_end:
+        # Parse the input dates to get integer years
+        start_year, _ = parse_date(time_start)
+        end_year, _ = parse_date(time_end)
+        # Find entities whose time range overlaps
+        person_conditions.append(
+            "n.birth_year <= $time_end AND n.death_year >= $time_start"
         )
-        entities = result.data()
+        event_conditions.append(
+            "n.start_year <= $time_end AND n.end_year >= $time_start"
+        )
+        params["time_start"] = start_year
+        params["time_end"] = end_year
 
+    if tags:
+        # Start from the few matching Tag nodes and expand to tagged entities
+        # instead of checking the tags of every Person and Event
+        person_match = "MATCH (tag:Tag)<-[:HAS_TAG]-(n:Person)"
+        event_match = "MATCH (tag:Tag)<-[:HAS_TAG]-(n:Event)"
+        person_conditions.insert(0, "tag.name IN $tags")
+        event_conditions.insert(0, "tag.name IN $tags")
+        params["tags"] = tags
+    else:
+        person_match = "MATCH (n:Person)"
+        event_match = "MATCH (n:Event)"
+
+    entities = session.execute_read(
+        collect_records,
+        f"""
+        CALL {{
+            {person_match} WHERE {" AND ".join(person_conditions)} RETURN DISTINCT n
+            UNION ALL
+            {event_match} WHERE {" AND ".join(event_conditions)} RETURN DISTINCT n
+        }}
+        OPTIONAL MATCH (n)-[:HAS_TAG]->(t:Tag)
+        WITH n, labels(n)[0] AS type, collect(t.name) AS tags
+        RETURN type,
+               n.name AS name,
+               coalesce(n.birth_year, n.start_year) AS start_year,
+               coalesce(n.birth_approximate, n.start_approximate) AS start_approx,
+               coalesce(n.death_year, n.end_year) AS end_year,
+               coalesce(n.death_approximate, n.end_approximate) AS end_approx,
+               tags
+        ORDER BY start_year, name
+        LIMIT $limit
+        """,
+        name=name,
+        **params,
+    )
     if not entities:
         print("No related entities found with the given criteria.")
         return
 
     print(f"Potentially related entities for '{name}':")
-    print(f"{'Type':<8} {'Name':<45} {'Dates':<15} {'Tags'}")
-    print("-" * 100)
+    print(RELATED_HEADER)
     for e in entities:
         ename = (e["name"] or "")[:43]
         start = format_date(e["start_year"], e["start_approx"])
@@ -529,42 +644,213 @@ def find_related(
         print(f"{e['type']:<8} {ename:<45} {dates:<15} {etags}")
 
 
-def run_cypher(driver, query: str):
+# Rows printed by the cypher command
+MAX_CYPHER_ROWS = 50
+# Queries that already bound their rows, or where a trailing LIMIT would
+# only apply to the last part
+LIMIT_OR_UNION_RE = re.compile(r"\b(?:LIMIT|UNION)\b", re.IGNORECASE)
+# A RETURN with no subquery braces after it, i.e. in the last clause
+FINAL_RETURN_RE = re.compile(r"\bRETURN\b[^{}]*$", re.IGNORECASE)
+
+
+def limit_cypher_rows(query: str) -> str | None:
+    """Append a LIMIT so the server stops after the rows we print.
+
+    Returns None if the query already has a LIMIT or does not end in RETURN.
+    """
+    query = query.strip().rstrip(";")
+    if LIMIT_OR_UNION_RE.search(query) or not FINAL_RETURN_RE.search(query):
+        return None
+    return f"{query}\nLIMIT {MAX_CYPHER_ROWS + 1}"
+
+
+def run_cypher(session, query: str):
     """Run an arbitrary Cypher query."""
-    with driver.session() as session:
+    from neo4j.exceptions import CypherSyntaxError
+
+    # Auto-commit, since the query may need it (e.g. CALL { } IN TRANSACTIONS)
+    # and a failed limited query must not abort the transaction for the retry
+    limited_query = limit_cypher_rows(query)
+    result = None
+    if limited_query:
+        try:
+            result = session.run(limited_query)
+        except CypherSyntaxError:
+            # A LIMIT can't go there, so run the query as given
+            pass
+    if result is None:
         result = session.run(query)
-        records = result.data()
+
+    # Stream records and stop once there is more than we print
+    records = []
+    truncated = False
+    for record in result:
+        if len(records) == MAX_CYPHER_ROWS:
+            truncated = True
+            break
+        records.append(record.data())
+    # Discard the rest without fetching it
+    result.consume()
 
     if not records:
         print("No results.")
         return
 
     # Print as simple table
-    if records:
-        keys = list(records[0].keys())
-        print(" | ".join(keys))
-        print("-" * (len(" | ".join(keys)) + 10))
-        for r in records[:50]:  # Limit output
-            values = [str(r.get(k, ""))[:200] for k in keys]
-            print(" | ".join(values))
-        if len(records) > 50:
-            print(f"... and {len(records) - 50} more rows")
+    keys = list(records[0].keys())
+    print(" | ".join(keys))
+    print("-" * (len(" | ".join(keys)) + 10))
+    for r in records:
+        values = [str(r.get(k, ""))[:200] for k in keys]
+        print(" | ".join(values))
+    if truncated:
+        print(f"... more rows (only the first {MAX_CYPHER_ROWS} are shown)")
+
+
+# Characters used in generated guids
+GUID_CHARS = (
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+/=[]{}()<>*&^%$#@!~"
+)
+GUID_LENGTH = 10
+# Number of distinct guids, so one random number picks a whole guid
+GUID_COUNT = len(GUID_CHARS) ** GUID_LENGTH
 
 
 def generate_guid() -> str:
     """Generate a short unique ID similar to existing guids."""
-    # Use base64-like encoding for compact representation
-    chars = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+/=[]{}()<>*&^%$#@!~"
-    uid = uuid.uuid4().bytes
-    result = []
-    for i in range(0, 10):
-        idx = uid[i] % len(chars)
-        result.append(chars[idx])
-    return "".join(result)
+    # Uniform over all guids: one draw, written out in base len(GUID_CHARS)
+    n = secrets.randbelow(GUID_COUNT)
+    chars = []
+    for _ in range(GUID_LENGTH):
+        n, i = divmod(n, len(GUID_CHARS))
+        chars.append(GUID_CHARS[i])
+    return "".join(chars)
+
+
+def add_tags(tx, label: str, guid: str, tags: list[str]):
+    """Link a node to tags, creating the tags that don't exist yet."""
+    tx.run(
+        f"""
+        MATCH (n:{label} {{guid: $guid}})
+        UNWIND $tags AS tag
+        MERGE (t:Tag {{name: tag}})
+        MERGE (n)-[:HAS_TAG]->(t)
+        """,
+        guid=guid,
+        tags=tags,
+    )
+
+
+def person_properties(
+    name: str,
+    known_for: str,
+    birth: str,
+    death: str,
+    notes: str | None = None,
+    source: str | None = None,
+    picture: str | None = None,
+) -> dict:
+    """Build the properties of a new Person node, including a fresh guid."""
+    birth_year, birth_approximate = parse_date(birth)
+    death_year, death_approximate = parse_date(death)
+    return {
+        "guid": generate_guid(),
+        "name": name,
+        "name_lower": name.lower(),
+        "known_for": known_for,
+        "birth_year": birth_year,
+        "birth_approximate": birth_approximate,
+        "death_year": death_year,
+        "death_approximate": death_approximate,
+        "notes": notes or "",
+        "source_license": source or "",
+        "picture": picture or "",
+    }
+
+
+def event_properties(
+    name: str,
+    summary: str,
+    start_date: str,
+    end_date: str,
+    notes: str | None = None,
+    source: str | None = None,
+) -> dict:
+    """Build the properties of a new Event node, including a fresh guid."""
+    start_year, start_approximate = parse_date(start_date)
+    end_year, end_approximate = parse_date(end_date)
+    return {
+        "guid": generate_guid(),
+        "name": name,
+        "name_lower": name.lower(),
+        "summary": summary,
+        "start_year": start_year,
+        "start_approximate": start_approximate,
+        "end_year": end_year,
+        "end_approximate": end_approximate,
+        "notes": notes or "",
+        "source_license": source or "",
+    }
+
+
+def qa_properties(
+    question: str,
+    answer: str,
+    notes: str | None = None,
+    source: str | None = None,
+) -> dict:
+    """Build the properties of a new QA node, including a fresh guid."""
+    return {
+        "guid": generate_guid(),
+        "question": question,
+        "question_lower": question.lower(),
+        "answer": answer,
+        "notes": notes or "",
+        "source_license": source or "",
+    }
+
+
+def cloze_properties(
+    text: str,
+    notes: str | None = None,
+    source: str | None = None,
+) -> dict:
+    """Build the properties of a new Cloze node, including a fresh guid."""
+    return {
+        "guid": generate_guid(),
+        "text": text,
+        "text_lower": text.lower(),
+        "notes": notes or "",
+        "source_license": source or "",
+    }
+
+
+def merge_entities(
+    tx, label: str, rows: list[dict], key: str = "name_lower"
+) -> list[bool]:
+    """Create nodes unless one with the same key property (e.g. name) exists.
+
+    Each row has the node's "props" and its "tags". Returns whether each row
+    created a node; only a newly created node gets the row's guid.
+    """
+    result = tx.run(
+        f"""
+        UNWIND $rows AS row
+        MERGE (n:{label} {{{key}: row.props.{key}}})
+        ON CREATE SET n += row.props
+        WITH n, row, n.guid = row.props.guid AS created
+        FOREACH (tag IN CASE WHEN created THEN row.tags ELSE [] END |
+            MERGE (t:Tag {{name: tag}})
+            MERGE (n)-[:HAS_TAG]->(t))
+        RETURN created
+        """,
+        rows=rows,
+    )
+    return result.value()
 
 
 def create_person(
-    driver,
+    session,
     name: str,
     known_for: str,
     birth: str,
@@ -574,77 +860,24 @@ def create_person(
     source: Optional[str] = None,
     picture: Optional[str] = None,
 ):
-    """Create a new Person node."""
+    """Create a new Person node, or leave an existing one with that name."""
     validate_entity_tags(tags)
-    guid = generate_guid()
-
-    # Parse dates
-    birth_year, birth_approximate = parse_date(birth)
-    death_year, death_approximate = parse_date(death)
-
-    with driver.session() as session:
-        # Check if person already exists
-        result = session.run(
-            "MATCH (p:Person) WHERE toLower(p.name) = toLower($name) RETURN p.name",
-            name=name,
-        )
-        if result.single():
-            print(f"Error: Person '{name}' already exists.", file=sys.stderr)
-            sys.exit(1)
-
-        # Create person
-        session.run(
-            """
-            CREATE (p:Person {
-                guid: $guid,
-                name: $name,
-                known_for: $known_for,
-                birth_year: $birth_year,
-                birth_approximate: $birth_approximate,
-                death_year: $death_year,
-                death_approximate: $death_approximate,
-                notes: $notes,
-                source_license: $source,
-                picture: $picture
-            })
-            """,
-            guid=guid,
-            name=name,
-            known_for=known_for,
-            birth_year=birth_year,
-            birth_approximate=birth_approximate,
-            death_year=death_year,
-            death_approximate=death_approximate,
-            notes=notes or "",
-            source=source or "",
-            picture=picture or "",
-        )
+    props = person_properties(name, known_for, birth, death, notes, source, picture)
 
-        # Create tags
-        if tags:
-            for tag in tags:
-                # Create tag if it doesn't exist
-                session.run(
-                    "MERGE (t:Tag {name: $tag})",
-                    tag=tag,
-                )
-                # Link person to tag
-                session.run(
-                    """
-                    MATCH (p:Person {guid: $guid}), (t:Tag {name: $tag})
-                    CREATE (p)-[:HAS_TAG]->(t)
-                    """,
-                    guid=guid,
-                    tag=tag,
-                )
+    # MERGE on a missing key property would create duplicates
+    check_lower_properties()
+    row = {"props": props, "tags": tags or []}
+    if not session.execute_write(merge_entities, "Person", [row])[0]:
+        print(f"Person '{name}' already exists.")
+        return
 
-    print(f"Created Person: {name} (guid: {guid})")
+    print(f"Created Person: {name} (guid: {props['guid']})")
     if tags:
         print(f"  Tags: {', '.join(tags)}")
 
 
 def create_event(
-    driver,
+    session,
     name: str,
     summary: str,
     start_date: str,
@@ -653,66 +886,274 @@ def create_event(
     notes: Optional[str] = None,
     source: Optional[str] = None,
 ):
-    """Create a new Event node."""
+    """Create a new Event node, or leave an existing one with that name."""
     validate_entity_tags(tags)
-    guid = generate_guid()
+    props = event_properties(name, summary, start_date, end_date, notes, source)
 
-    # Parse dates
-    start_year, start_approximate = parse_date(start_date)
-    end_year, end_approximate = parse_date(end_date)
+    # MERGE on a missing key property would create duplicates
+    check_lower_properties()
+    row = {"props": props, "tags": tags or []}
+    if not session.execute_write(merge_entities, "Event", [row])[0]:
+        print(f"Event '{name}' already exists.")
+        return
+
+    print(f"Created Event: {name} (guid: {props['guid']})")
+    if tags:
+        print(f"  Tags: {', '.join(tags)}")
+
+
+# Rows created per transaction by the bulk create commands
+BULK_BATCH_SIZE = 1000
+# Lists bulk-import reads, in the order they are written
+BULK_IMPORT_KEYS = ("persons", "events", "qas", "clozes", "relationships")
+
+
+def load_bulk_file(path: str):
+    """Load a JSON file for the bulk commands."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except OSError as e:
+        print(f"Error: Cannot read {path}. {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {path} is not valid JSON. {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# Optional text fields of bulk entries
+BULK_OPTIONAL_FIELDS = ("notes", "source", "picture")
+
+
+def exit_bad_entry(i: int, source: str, problem: str):
+    """Report a problem with entry i of a bulk file and exit."""
+    print(f"Error: Entry {i} of {source} {problem}.", file=sys.stderr)
+    sys.exit(1)
+
+
+def check_bulk_rows(
+    rows, required: list[str], source: str, dates: tuple[str, ...] = ()
+) -> list[dict]:
+    """Check a list of entities, exiting if an entry is not like the CLI takes it.
+
+    Required fields must be non-empty strings, optional fields strings,
+    tags a list of strings, and the dates fields valid dates.
+    """
+    if not isinstance(rows, list):
+        print(f"Error: {source} must be a JSON list.", file=sys.stderr)
+        sys.exit(1)
+    for i, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            exit_bad_entry(i, source, "is not a JSON object")
+        missing = [field for field in required if not row.get(field)]
+        if missing:
+            exit_bad_entry(i, source, f"is missing {', '.join(missing)}")
+        for field in (*required, *BULK_OPTIONAL_FIELDS):
+            if row.get(field) is not None and not isinstance(row[field], str):
+                exit_bad_entry(i, source, f"has a '{field}' field that is not a string")
+        tags = row.get("tags")
+        if tags is not None and not (
+            isinstance(tags, list) and all(isinstance(tag, str) for tag in tags)
+        ):
+            exit_bad_entry(i, source, "has tags that are not a list of strings")
+        for field in dates:
+            try:
+                parse_date(row[field])
+            except ValueError:
+                exit_bad_entry(
+                    i,
+                    source,
+                    f"has an invalid {field} '{row[field]}', "
+                    "use a year like 1815, c. 1760 or 500 BCE",
+                )
+        validate_entity_tags(tags)
+    return rows
 
-    with driver.session() as session:
-        # Check if event already exists
-        result = session.run(
-            "MATCH (e:Event) WHERE toLower(e.name) = toLower($name) RETURN e.name",
-            name=name,
+
+def create_bulk(session, label: str, rows: list[dict], key: str = "name_lower"):
+    """Create entities from prepared rows, one transaction per batch.
+
+    Entities whose key (e.g. name) already exists are skipped, so a failed
+    import can be re-run.
+    """
+    # MERGE on a missing key property would create duplicates
+    check_lower_properties()
+    created = 0
+    for i in range(0, len(rows), BULK_BATCH_SIZE):
+        batch = rows[i : i + BULK_BATCH_SIZE]
+        created += sum(session.execute_write(merge_entities, label, batch, key))
+
+    print(f"Created {created} {label} nodes")
+    if created < len(rows):
+        print(f"  Skipped {len(rows) - created} that already exist")
+
+
+def person_rows(entries, source: str) -> list[dict]:
+    """Prepare create-person style entries for create_bulk."""
+    return [
+        {
+            "props": person_properties(
+                row["name"],
+                row["known_for"],
+                row["birth"],
+                row["death"],
+                row.get("notes"),
+                row.get("source"),
+                row.get("picture"),
+            ),
+            "tags": row.get("tags") or [],
+        }
+        for row in check_bulk_rows(
+            entries, ["name", "known_for", "birth", "death"], source, ("birth", "death")
+        )
+    ]
+
+
+def event_rows(entries, source: str) -> list[dict]:
+    """Prepare create-event style entries for create_bulk."""
+    return [
+        {
+            "props": event_properties(
+                row["name"],
+                row["summary"],
+                row["start"],
+                row["end"],
+                row.get("notes"),
+                row.get("source"),
+            ),
+            "tags": row.get("tags") or [],
+        }
+        for row in check_bulk_rows(
+            entries, ["name", "summary", "start", "end"], source, ("start", "end")
         )
-        if result.single():
-            print(f"Error: Event '{name}' already exists.", file=sys.stderr)
+    ]
+
+
+def qa_rows(entries, source: str) -> list[dict]:
+    """Prepare create-qa style entries for create_bulk."""
+    return [
+        {
+            "props": qa_properties(
+                row["question"], row["answer"], row.get("notes"), row.get("source")
+            ),
+            "tags": row.get("tags") or [],
+        }
+        for row in check_bulk_rows(entries, ["question", "answer"], source)
+    ]
+
+
+def cloze_rows(entries, source: str) -> list[dict]:
+    """Prepare create-cloze style entries for create_bulk."""
+    rows = []
+    for i, row in enumerate(check_bulk_rows(entries, ["text"], source), 1):
+        is_valid, error_msg = validate_cloze_text(row["text"])
+        if not is_valid:
+            print(
+                f"Error: Entry {i} of {source} has invalid cloze text. {error_msg}",
+                file=sys.stderr,
+            )
             sys.exit(1)
+        rows.append(
+            {
+                "props": cloze_properties(
+                    row["text"], row.get("notes"), row.get("source")
+                ),
+                "tags": row.get("tags") or [],
+            }
+        )
+    return rows
 
-        # Create event
-        session.run(
-            """
-            CREATE (e:Event {
-                guid: $guid,
-                name: $name,
-                summary: $summary,
-                start_year: $start_year,
-                start_approximate: $start_approximate,
-                end_year: $end_year,
-                end_approximate: $end_approximate,
-                notes: $notes,
-                source_license: $source
-            })
-            """,
-            guid=guid,
-            name=name,
-            summary=summary,
-            start_year=start_year,
-            start_approximate=start_approximate,
-            end_year=end_year,
-            end_approximate=end_approximate,
-            notes=notes or "",
-            source=source or "",
+
+def relationship_rows(entries, source: str) -> list[dict]:
+    """Prepare add-rel style entries for add_relationships_bulk."""
+    return [
+        {
+            "source_lower": row["source"].lower(),
+            "target_lower": row["target"].lower(),
+            "description": row["description"],
+        }
+        for row in check_bulk_rows(entries, ["source", "target", "description"], source)
+    ]
+
+
+def add_relationships_bulk(session, rows: list[dict], entries: list[dict]):
+    """Add relationships from prepared rows, one transaction per batch.
+
+    Existing relationships are skipped. Entries naming a missing entity are
+    reported after the rest have been added.
+    """
+    created = existing = 0
+    missing = []
+    for i in range(0, len(rows), BULK_BATCH_SIZE):
+        batch = rows[i : i + BULK_BATCH_SIZE]
+        records = session.execute_write(merge_relationships, batch)
+        for j, record in enumerate(records, i):
+            if not record["source_found"]:
+                missing.append(f"Source entity '{entries[j]['source']}'")
+            elif record["target_type"] is None:
+                missing.append(f"Target entity '{entries[j]['target']}'")
+            elif record["already_related"]:
+                existing += 1
+            else:
+                created += 1
+
+    print(f"Created {created} relationships")
+    if existing:
+        print(f"  Skipped {existing} that already exist")
+    if missing:
+        check_lower_properties()
+        for entity in missing:
+            print(f"Error: {entity} not found.", file=sys.stderr)
+        sys.exit(1)
+
+
+def create_persons_bulk(session, path: str):
+    """Create Person nodes from a JSON file with the create-person fields."""
+    create_bulk(session, "Person", person_rows(load_bulk_file(path), path))
+
+
+def create_events_bulk(session, path: str):
+    """Create Event nodes from a JSON file with the create-event fields."""
+    create_bulk(session, "Event", event_rows(load_bulk_file(path), path))
+
+
+def bulk_import(session, path: str):
+    """Create entities and relationships from one JSON file.
+
+    The file holds an object with optional "persons", "events", "qas",
+    "clozes" and "relationships" lists. Everything is validated before the
+    first batch is written, and relationships are added last so they can
+    refer to entities from the same file.
+    """
+    data = load_bulk_file(path)
+    if not isinstance(data, dict):
+        print(
+            f"Error: {path} must contain a JSON object with any of "
+            f"{', '.join(BULK_IMPORT_KEYS)}.",
+            file=sys.stderr,
         )
+        sys.exit(1)
+    persons = person_rows(data.get("persons", []), f"{path} persons")
+    events = event_rows(data.get("events", []), f"{path} events")
+    qas = qa_rows(data.get("qas", []), f"{path} qas")
+    clozes = cloze_rows(data.get("clozes", []), f"{path} clozes")
+    relationship_entries = data.get("relationships", [])
+    relationships = relationship_rows(relationship_entries, f"{path} relationships")
 
-        # Create tags
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (e:Event {guid: $guid}), (t:Tag {name: $tag})
-                    CREATE (e)-[:HAS_TAG]->(t)
-                    """,
-                    guid=guid,
-                    tag=tag,
-                )
+    for label, rows, key in (
+        ("Person", persons, "name_lower"),
+        ("Event", events, "name_lower"),
+        ("QA", qas, "question_lower"),
+        ("Cloze", clozes, "text_lower"),
+    ):
+        if rows:
+            create_bulk(session, label, rows, key)
+    if relationships:
+        add_relationships_bulk(session, relationships, relationship_entries)
 
-    print(f"Created Event: {name} (guid: {guid})")
-    if tags:
-        print(f"  Tags: {', '.join(tags)}")
+
+# Cloze deletions like {{c1::text}} or {{c1::text::hint}}
+CLOZE_RE = re.compile(r"\{\{c(\d+)::([^}]+)\}\}")
 
 
 def validate_cloze_text(text: str) -> tuple[bool, str]:
@@ -720,81 +1161,47 @@ def validate_cloze_text(text: str) -> tuple[bool, str]:
 
     Returns (is_valid, error_message).
     """
-    # Find all cloze patterns like {{c1::text}} or {{c1::text::hint}}
-    pattern = r"\{\{c(\d+)::([^}]+)\}\}"
-    matches = re.findall(pattern, text)
+    matches = CLOZE_RE.findall(text)
 
     if not matches:
         return False, "No cloze deletions found. Use {{c1::text}} format."
 
     # Check that cloze numbers start at 1 and are sequential (with gaps allowed)
-    cloze_numbers = sorted(set(int(m[0]) for m in matches))
+    first_number = min(int(num) for num, _ in matches)
 
-    if cloze_numbers[0] != 1:
-        return False, f"Cloze numbers must start at 1, found: {cloze_numbers[0]}"
+    if first_number != 1:
+        return False, f"Cloze numbers must start at 1, found: {first_number}"
 
     # Check for empty cloze content
     for num, content in matches:
         # Content might have hint like "text::hint", extract just the text
-        actual_text = content.split("::")[0].strip()
-        if not actual_text:
+        if not content.split("::", 1)[0].strip():
             return False, f"Cloze {{{{c{num}::}}}} has empty content."
 
     return True, ""
 
 
 def create_qa(
-    driver,
+    session,
     question: str,
     answer: str,
     tags: Optional[list[str]] = None,
     notes: Optional[str] = None,
     source: Optional[str] = None,
 ):
-    """Create a new QA node."""
+    """Create a new QA node, or leave an existing one with that question."""
     validate_entity_tags(tags)
-    guid = generate_guid()
+    props = qa_properties(question, answer, notes, source)
+    guid = props["guid"]
 
-    with driver.session() as session:
-        # Check if QA already exists with same question
-        result = session.run(
-            "MATCH (q:QA) WHERE toLower(q.question) = toLower($question) RETURN q.question",
-            question=question,
-        )
-        if result.single():
-            print("Error: QA with this question already exists.", file=sys.stderr)
-            sys.exit(1)
-
-        # Create QA
-        session.run(
-            """
-            CREATE (q:QA {
-                guid: $guid,
-                question: $question,
-                answer: $answer,
-                notes: $notes,
-                source_license: $source
-            })
-            """,
-            guid=guid,
-            question=question,
-            answer=answer,
-            notes=notes or "",
-            source=source or "",
-        )
+    # MERGE on a missing key property would create duplicates
+    check_lower_properties()
 
-        # Create tags
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (q:QA {guid: $guid}), (t:Tag {name: $tag})
-                    CREATE (q)-[:HAS_TAG]->(t)
-                    """,
-                    guid=guid,
-                    tag=tag,
-                )
+    # Create QA and link its tags unless one with the same question exists
+    row = {"props": props, "tags": tags or []}
+    if not session.execute_write(merge_entities, "QA", [row], "question_lower")[0]:
+        print("QA with this question already exists.")
+        return
 
     print(f"Created QA: {question[:60]}... (guid: {guid})")
     if tags:
@@ -802,13 +1209,13 @@ def create_qa(
 
 
 def create_cloze(
-    driver,
+    session,
     text: str,
     tags: Optional[list[str]] = None,
     notes: Optional[str] = None,
     source: Optional[str] = None,
 ):
-    """Create a new Cloze node."""
+    """Create a new Cloze node, or leave an existing one with that text."""
     validate_entity_tags(tags)
 
     # Validate cloze text
@@ -817,46 +1224,17 @@ def create_cloze(
         print(f"Error: Invalid cloze text. {error_msg}", file=sys.stderr)
         sys.exit(1)
 
-    guid = generate_guid()
-
-    with driver.session() as session:
-        # Check if Cloze already exists with same text
-        result = session.run(
-            "MATCH (c:Cloze) WHERE toLower(c.text) = toLower($text) RETURN c.text",
-            text=text,
-        )
-        if result.single():
-            print("Error: Cloze with this text already exists.", file=sys.stderr)
-            sys.exit(1)
+    props = cloze_properties(text, notes, source)
+    guid = props["guid"]
 
-        # Create Cloze
-        session.run(
-            """
-            CREATE (c:Cloze {
-                guid: $guid,
-                text: $text,
-                notes: $notes,
-                source_license: $source
-            })
-            """,
-            guid=guid,
-            text=text,
-            notes=notes or "",
-            source=source or "",
-        )
+    # MERGE on a missing key property would create duplicates
+    check_lower_properties()
 
-        # Create tags
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (c:Cloze {guid: $guid}), (t:Tag {name: $tag})
-                    CREATE (c)-[:HAS_TAG]->(t)
-                    """,
-                    guid=guid,
-                    tag=tag,
-                )
+    # Create Cloze and link its tags unless one with the same text exists
+    row = {"props": props, "tags": tags or []}
+    if not session.execute_write(merge_entities, "Cloze", [row], "text_lower")[0]:
+        print("Cloze with this text already exists.")
+        return
 
     # Show preview of cloze (first 60 chars)
     preview = text[:60].replace("\n", " ")
@@ -875,6 +1253,10 @@ VALID_REGIONS = {
     "Oceania": ["Australia", "Pacific"],
     "Global": [],  # No sub-regions
 }
+# Sets for membership tests; the lists above keep the order for messages
+VALID_SUB_REGIONS = {
+    continent: frozenset(subs) for continent, subs in VALID_REGIONS.items()
+}
 
 # Themes: curated list (new themes require discussion)
 VALID_THEMES = [
@@ -886,40 +1268,52 @@ VALID_THEMES = [
     "Science",
     "Religion",
 ]
+VALID_THEME_SET = frozenset(VALID_THEMES)
+
 
+# UH::<category>::<value>[::<sub_value>], split on "::" like str.split;
+# extra holds anything beyond the fourth part
+TAG_RE = re.compile(
+    r"UH::(?P<category>.*?)::(?P<value>.*?)(?:::(?P<sub_value>.*?))?(?P<extra>::.*)?",
+    re.DOTALL,
+)
 
+
+# Bulk imports validate the same few tags over and over
+@cache
 def validate_tag(tag_name: str) -> tuple[bool, str]:
     """Validate a tag against the allowed structure.
 
     Returns (is_valid, error_message).
     """
-    if not tag_name.startswith("UH::"):
-        return False, "Tag must start with 'UH::'"
-
-    parts = tag_name.split("::")
-    if len(parts) < 3:
+    match = TAG_RE.fullmatch(tag_name)
+    if not match:
+        if not tag_name.startswith("UH::"):
+            return False, "Tag must start with 'UH::'"
         return False, "Tag must have at least 3 parts (e.g., UH::Region::Europe)"
 
-    category = parts[1]
+    category, value, sub_value, extra = match.group(
+        "category", "value", "sub_value", "extra"
+    )
 
     if category == "Region":
-        if len(parts) < 3 or len(parts) > 4:
+        if extra is not None:
             return (
                 False,
                 "Region tags must be UH::Region::<continent> or UH::Region::<continent>::<sub-region>",
             )
-        continent = parts[2]
+        continent = value
         if continent not in VALID_REGIONS:
             return (
                 False,
                 f"Unknown continent '{continent}'. Valid: {', '.join(VALID_REGIONS.keys())}",
             )
-        if len(parts) == 4:
-            sub_region = parts[3]
+        if sub_value is not None:
+            sub_region = sub_value
             valid_subs = VALID_REGIONS[continent]
             if not valid_subs:
                 return False, f"'{continent}' has no sub-regions"
-            if sub_region not in valid_subs:
+            if sub_region not in VALID_SUB_REGIONS[continent]:
                 return (
                     False,
                     f"Unknown sub-region '{sub_region}' for {continent}. Valid: {', '.join(valid_subs)}",
@@ -927,9 +1321,9 @@ def validate_tag(tag_name: str) -> tuple[bool, str]:
         return True, ""
 
     elif category == "Period":
-        if len(parts) != 3:
+        if sub_value is not None:
             return False, "Period tags must be UH::Period::<period>"
-        period = parts[2]
+        period = value
         # Allow: Prehistory, centuries (1st_Century, 19th_Century, 5th_Century_BCE), millennia
         if period == "Prehistory":
             return True, ""
@@ -941,10 +1335,10 @@ def validate_tag(tag_name: str) -> tuple[bool, str]:
         )
 
     elif category == "Theme":
-        if len(parts) != 3:
+        if sub_value is not None:
             return False, "Theme tags must be UH::Theme::<theme>"
-        theme = parts[2]
-        if theme not in VALID_THEMES:
+        theme = value
+        if theme not in VALID_THEME_SET:
             return (
                 False,
                 f"Unknown theme '{theme}'. Valid: {', '.join(VALID_THEMES)}. New themes require discussion.",
@@ -955,7 +1349,7 @@ def validate_tag(tag_name: str) -> tuple[bool, str]:
         return False, f"Unknown category '{category}'. Valid: Region, Period, Theme"
 
 
-def validate_entity_tags(tags: Optional[list[str]]) -> None:
+def validate_entity_tags(tags: list[str] | None) -> None:
     """Validate tags for an entity, warning about invalid ones."""
     if not tags:
         return
@@ -965,7 +1359,20 @@ def validate_entity_tags(tags: Optional[list[str]]) -> None:
             print(f"Warning: Invalid tag '{tag}'. {error_msg}", file=sys.stderr)
 
 
-def create_tag(driver, tag_name: str):
+def create_tag_node(tx, tag_name: str) -> bool:
+    """Create a Tag node unless it exists. Returns whether it was created."""
+    result = tx.run(
+        "MATCH (t:Tag {name: $name}) RETURN t.name",
+        name=tag_name,
+    )
+    if result.single():
+        return False
+
+    tx.run("CREATE (t:Tag {name: $name})", name=tag_name)
+    return True
+
+
+def create_tag(session, tag_name: str):
     """Create a new tag (only Region and Period tags allowed via CLI)."""
     # Theme tags cannot be created directly - they're auto-created when used
     if tag_name.startswith("UH::Theme::"):
@@ -982,172 +1389,210 @@ def create_tag(driver, tag_name: str):
         print(f"Error: Invalid tag. {error_msg}", file=sys.stderr)
         sys.exit(1)
 
-    with driver.session() as session:
-        # Check if tag already exists
-        result = session.run(
-            "MATCH (t:Tag {name: $name}) RETURN t.name",
-            name=tag_name,
-        )
-        if result.single():
-            print(f"Error: Tag '{tag_name}' already exists.", file=sys.stderr)
-            sys.exit(1)
-
-        # Create tag
-        session.run("CREATE (t:Tag {name: $name})", name=tag_name)
+    if not session.execute_write(create_tag_node, tag_name):
+        print(f"Error: Tag '{tag_name}' already exists.", file=sys.stderr)
+        sys.exit(1)
 
     print(f"Created Tag: {tag_name}")
 
 
+def merge_relationships(tx, rows: list[dict]) -> list["Record"]:
+    """Relate Persons and Events by lower-cased name unless already related.
+
+    Each row has "source_lower", "target_lower" and "description". Returns
+    a record per row with source_found, target_type (None if the target is
+    missing) and already_related.
+    """
+    # Find both entities and create the relationship unless it already
+    # exists, in one statement. The relationship type depends on the
+    # target's label, so each type gets its own conditional subquery.
+    result = tx.run(
+        """
+        UNWIND $rows AS row
+        WITH
+            row,
+            COLLECT {
+                MATCH (n:Person) WHERE n.name_lower = row.source_lower RETURN n
+                UNION
+                MATCH (n:Event) WHERE n.name_lower = row.source_lower RETURN n
+            } AS sources,
+            COLLECT {
+                MATCH (n:Person) WHERE n.name_lower = row.target_lower RETURN n
+                UNION
+                MATCH (n:Event) WHERE n.name_lower = row.target_lower RETURN n
+            } AS targets
+        WITH row, sources[0] AS s, targets[0] AS t
+        WITH row, s, t, labels(t)[0] AS target_type,
+             EXISTS {
+                 MATCH (s)-[r]->(t)
+                 WHERE type(r) = 'RELATED_TO_' + toUpper(labels(t)[0])
+             } AS already_related
+        CALL {
+            WITH row, s, t, already_related
+            WITH row, s, t WHERE s IS NOT NULL AND t:Person AND NOT already_related
+            MERGE (s)-[r:RELATED_TO_PERSON]->(t)
+            ON CREATE SET r.description = row.description
+        }
+        CALL {
+            WITH row, s, t, already_related
+            WITH row, s, t WHERE s IS NOT NULL AND t:Event AND NOT already_related
+            MERGE (s)-[r:RELATED_TO_EVENT]->(t)
+            ON CREATE SET r.description = row.description
+        }
+        RETURN s IS NOT NULL AS source_found, target_type, already_related
+        """,
+        rows=rows,
+    )
+    return list(result)
+
+
 def add_relationship(
-    driver,
+    session,
     source_name: str,
     target_name: str,
     description: str,
 ):
     """Add a relationship between two entities (Person or Event)."""
-    with driver.session() as session:
-        # Find source entity
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event) AND toLower(n.name) = toLower($name)
-            RETURN n, labels(n)[0] AS type
-            """,
-            name=source_name,
-        )
-        source = result.single()
-        if not source:
-            print(f"Error: Source entity '{source_name}' not found.", file=sys.stderr)
-            sys.exit(1)
+    row = {
+        "source_lower": source_name.lower(),
+        "target_lower": target_name.lower(),
+        "description": description,
+    }
+    record = session.execute_write(merge_relationships, [row])[0]
+    if not record["source_found"]:
+        check_lower_properties()
+        print(f"Error: Source entity '{source_name}' not found.", file=sys.stderr)
+        sys.exit(1)
+    if record["target_type"] is None:
+        check_lower_properties()
+        print(f"Error: Target entity '{target_name}' not found.", file=sys.stderr)
+        sys.exit(1)
 
-        # Find target entity
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event) AND toLower(n.name) = toLower($name)
-            RETURN n, labels(n)[0] AS type
-            """,
-            name=target_name,
-        )
-        target = result.single()
-        if not target:
-            print(f"Error: Target entity '{target_name}' not found.", file=sys.stderr)
-            sys.exit(1)
+    rel_type = f"RELATED_TO_{record['target_type'].upper()}"
 
-        source_type = source["type"]
-        target_type = target["type"]
-        rel_type = f"RELATED_TO_{target_type.upper()}"
-
-        # Check if relationship already exists
-        result = session.run(
-            f"""
-            MATCH (s:{source_type})-[r:{rel_type}]->(t:{target_type})
-            WHERE toLower(s.name) = toLower($source) AND toLower(t.name) = toLower($target)
-            RETURN r
-            """,
-            source=source_name,
-            target=target_name,
-        )
-        if result.single():
-            print(
-                f"Error: Relationship already exists from '{source_name}' to '{target_name}'.",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-
-        # Create relationship
-        session.run(
-            f"""
-            MATCH (s:{source_type}), (t:{target_type})
-            WHERE toLower(s.name) = toLower($source) AND toLower(t.name) = toLower($target)
-            CREATE (s)-[:{rel_type} {{description: $description}}]->(t)
-            """,
-            source=source_name,
-            target=target_name,
-            description=description,
-        )
+    # Re-adding an existing relationship leaves it as it is
+    if record["already_related"]:
+        print(f"Relationship already exists from '{source_name}' to '{target_name}'.")
+        return
 
     print(f"Created relationship: {source_name} -> {target_name}")
     print(f"  Type: {rel_type}")
     print(f"  Description: {description}")
 
 
+def remove_relationship(
+    tx, source_lower: str, target_lower: str
+) -> tuple[bool, bool, list[str]]:
+    """Delete the relationship from one Person or Event to another.
+
+    Returns whether the source and the target were found, and the
+    descriptions of the deleted relationships (empty if there were none).
+    """
+    # Find source entity
+    result = tx.run(
+        PERSON_OR_EVENT_BY_NAME_MATCH
+        + """
+        RETURN n, labels(n)[0] AS type
+        """,
+        name_lower=source_lower,
+    )
+    source = result.single()
+
+    # Find target entity
+    result = tx.run(
+        PERSON_OR_EVENT_BY_NAME_MATCH
+        + """
+        RETURN n, labels(n)[0] AS type
+        """,
+        name_lower=target_lower,
+    )
+    target = result.single()
+    if not source or not target:
+        return source is not None, target is not None, []
+
+    source_type = source["type"]
+    target_type = target["type"]
+    rel_type = f"RELATED_TO_{target_type.upper()}"
+
+    # Delete relationship
+    result = tx.run(
+        f"""
+        MATCH (s:{source_type})-[r:{rel_type}]->(t:{target_type})
+        WHERE s.name_lower = $source_lower AND t.name_lower = $target_lower
+        WITH r, r.description AS description
+        DELETE r
+        RETURN description
+        """,
+        source_lower=source_lower,
+        target_lower=target_lower,
+    )
+    return True, True, result.value()
+
+
 def delete_relationship(
-    driver,
+    session,
     source_name: str,
     target_name: str,
 ):
     """Delete a relationship between two entities (Person or Event)."""
-    with driver.session() as session:
-        # Find source entity
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event) AND toLower(n.name) = toLower($name)
-            RETURN n, labels(n)[0] AS type
-            """,
-            name=source_name,
+    source_found, target_found, descriptions = session.execute_write(
+        remove_relationship, source_name.lower(), target_name.lower()
+    )
+    if not source_found:
+        check_lower_properties()
+        print(f"Error: Source entity '{source_name}' not found.", file=sys.stderr)
+        sys.exit(1)
+    if not target_found:
+        check_lower_properties()
+        print(f"Error: Target entity '{target_name}' not found.", file=sys.stderr)
+        sys.exit(1)
+    if not descriptions:
+        print(
+            f"Error: No relationship found from '{source_name}' to '{target_name}'.",
+            file=sys.stderr,
         )
-        source = result.single()
-        if not source:
-            print(f"Error: Source entity '{source_name}' not found.", file=sys.stderr)
-            sys.exit(1)
+        sys.exit(1)
 
-        # Find target entity
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event) AND toLower(n.name) = toLower($name)
-            RETURN n, labels(n)[0] AS type
-            """,
-            name=target_name,
-        )
-        target = result.single()
-        if not target:
-            print(f"Error: Target entity '{target_name}' not found.", file=sys.stderr)
-            sys.exit(1)
+    print(f"Deleted relationship: {source_name} -> {target_name}")
+    print(f"  Was: {descriptions[0]}")
 
-        source_type = source["type"]
-        target_type = target["type"]
-        rel_type = f"RELATED_TO_{target_type.upper()}"
-
-        # Check if relationship exists
-        result = session.run(
-            f"""
-            MATCH (s:{source_type})-[r:{rel_type}]->(t:{target_type})
-            WHERE toLower(s.name) = toLower($source) AND toLower(t.name) = toLower($target)
-            RETURN r.description AS description
-            """,
-            source=source_name,
-            target=target_name,
-        )
-        record = result.single()
-        if not record:
-            print(
-                f"Error: No relationship found from '{source_name}' to '{target_name}'.",
-                file=sys.stderr,
-            )
-            sys.exit(1)
 
-        description = record["description"]
-
-        # Delete relationship
-        session.run(
-            f"""
-            MATCH (s:{source_type})-[r:{rel_type}]->(t:{target_type})
-            WHERE toLower(s.name) = toLower($source) AND toLower(t.name) = toLower($target)
-            DELETE r
-            """,
-            source=source_name,
-            target=target_name,
-        )
+def update_node(
+    tx,
+    label: str,
+    key: str,
+    value: str,
+    set_clauses: list[str],
+    params: dict,
+    tags: list[str] | None,
+) -> bool:
+    """Set properties of the node n whose key property equals value, and add tags.
 
-    print(f"Deleted relationship: {source_name} -> {target_name}")
-    print(f"  Was: {description}")
+    Returns False if there is no such node.
+    """
+    result = tx.run(
+        f"MATCH (n:{label}) WHERE n.{key} = $value RETURN n.guid AS guid",
+        value=value,
+    )
+    record = result.single()
+    if not record:
+        return False
+
+    if set_clauses:
+        query = f"""
+        MATCH (n:{label}) WHERE n.{key} = $value
+        SET {", ".join(set_clauses)}
+        """
+        tx.run(query, value=value, **params)
+
+    # Add new tags (existing tags are preserved)
+    if tags:
+        add_tags(tx, label, record["guid"], tags)
+    return True
 
 
 def update_person(
-    driver,
+    session,
     name: str,
     new_name: Optional[str] = None,
     known_for: Optional[str] = None,
@@ -1162,73 +1607,51 @@ def update_person(
     if tags:
         validate_entity_tags(tags)
 
-    with driver.session() as session:
-        # Find person
-        result = session.run(
-            "MATCH (p:Person) WHERE toLower(p.name) = toLower($name) RETURN p",
-            name=name,
-        )
-        record = result.single()
-        if not record:
-            print(f"Error: Person '{name}' not found.", file=sys.stderr)
-            sys.exit(1)
-
-        # Build SET clauses for provided fields
-        set_clauses = []
-        params: dict = {"name": name}
-
-        if new_name is not None:
-            set_clauses.append("p.name = $new_name")
-            params["new_name"] = new_name
-        if known_for is not None:
-            set_clauses.append("p.known_for = $known_for")
-            params["known_for"] = known_for
-        if birth is not None:
-            birth_year, birth_approximate = parse_date(birth)
-            set_clauses.append("p.birth_year = $birth_year")
-            set_clauses.append("p.birth_approximate = $birth_approximate")
-            params["birth_year"] = birth_year
-            params["birth_approximate"] = birth_approximate
-        if death is not None:
-            death_year, death_approximate = parse_date(death)
-            set_clauses.append("p.death_year = $death_year")
-            set_clauses.append("p.death_approximate = $death_approximate")
-            params["death_year"] = death_year
-            params["death_approximate"] = death_approximate
-        if notes is not None:
-            set_clauses.append("p.notes = $notes")
-            params["notes"] = notes
-        if source is not None:
-            set_clauses.append("p.source_license = $source")
-            params["source"] = source
-        if picture is not None:
-            set_clauses.append("p.picture = $picture")
-            params["picture"] = picture
-
-        if not set_clauses and not tags:
-            print("No fields to update.", file=sys.stderr)
-            sys.exit(1)
+    # Build SET clauses for provided fields
+    set_clauses = []
+    params: dict = {}
+
+    if new_name is not None:
+        set_clauses.append("n.name = $new_name")
+        set_clauses.append("n.name_lower = $new_name_lower")
+        params["new_name"] = new_name
+        params["new_name_lower"] = new_name.lower()
+    if known_for is not None:
+        set_clauses.append("n.known_for = $known_for")
+        params["known_for"] = known_for
+    if birth is not None:
+        birth_year, birth_approximate = parse_date(birth)
+        set_clauses.append("n.birth_year = $birth_year")
+        set_clauses.append("n.birth_approximate = $birth_approximate")
+        params["birth_year"] = birth_year
+        params["birth_approximate"] = birth_approximate
+    if death is not None:
+        death_year, death_approximate = parse_date(death)
+        set_clauses.append("n.death_year = $death_year")
+        set_clauses.append("n.death_approximate = $death_approximate")
+        params["death_year"] = death_year
+        params["death_approximate"] = death_approximate
+    if notes is not None:
+        set_clauses.append("n.notes = $notes")
+        params["notes"] = notes
+    if source is not None:
+        set_clauses.append("n.source_license = $source")
+        params["source"] = source
+    if picture is not None:
+        set_clauses.append("n.picture = $picture")
+        params["picture"] = picture
+
+    if not set_clauses and not tags:
+        print("No fields to update.", file=sys.stderr)
+        sys.exit(1)
 
-        if set_clauses:
-            query = f"""
-            MATCH (p:Person) WHERE toLower(p.name) = toLower($name)
-            SET {", ".join(set_clauses)}
-            """
-            session.run(query, **params)
-
-        # Add new tags (existing tags are preserved)
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (p:Person) WHERE toLower(p.name) = toLower($name)
-                    MATCH (t:Tag {name: $tag})
-                    MERGE (p)-[:HAS_TAG]->(t)
-                    """,
-                    name=name,
-                    tag=tag,
-                )
+    found = session.execute_write(
+        update_node, "Person", "name_lower", name.lower(), set_clauses, params, tags
+    )
+    if not found:
+        check_lower_properties()
+        print(f"Error: Person '{name}' not found.", file=sys.stderr)
+        sys.exit(1)
 
     print(f"Updated Person: {new_name or name}")
     if tags:
@@ -1236,7 +1659,7 @@ def update_person(
 
 
 def update_event(
-    driver,
+    session,
     name: str,
     new_name: Optional[str] = None,
     summary: Optional[str] = None,
@@ -1250,70 +1673,48 @@ def update_event(
     if tags:
         validate_entity_tags(tags)
 
-    with driver.session() as session:
-        # Find event
-        result = session.run(
-            "MATCH (e:Event) WHERE toLower(e.name) = toLower($name) RETURN e",
-            name=name,
-        )
-        record = result.single()
-        if not record:
-            print(f"Error: Event '{name}' not found.", file=sys.stderr)
-            sys.exit(1)
-
-        # Build SET clauses for provided fields
-        set_clauses = []
-        params: dict = {"name": name}
-
-        if new_name is not None:
-            set_clauses.append("e.name = $new_name")
-            params["new_name"] = new_name
-        if summary is not None:
-            set_clauses.append("e.summary = $summary")
-            params["summary"] = summary
-        if start_date is not None:
-            start_year, start_approximate = parse_date(start_date)
-            set_clauses.append("e.start_year = $start_year")
-            set_clauses.append("e.start_approximate = $start_approximate")
-            params["start_year"] = start_year
-            params["start_approximate"] = start_approximate
-        if end_date is not None:
-            end_year, end_approximate = parse_date(end_date)
-            set_clauses.append("e.end_year = $end_year")
-            set_clauses.append("e.end_approximate = $end_approximate")
-            params["end_year"] = end_year
-            params["end_approximate"] = end_approximate
-        if notes is not None:
-            set_clauses.append("e.notes = $notes")
-            params["notes"] = notes
-        if source is not None:
-            set_clauses.append("e.source_license = $source")
-            params["source"] = source
-
-        if not set_clauses and not tags:
-            print("No fields to update.", file=sys.stderr)
-            sys.exit(1)
+    # Build SET clauses for provided fields
+    set_clauses = []
+    params: dict = {}
+
+    if new_name is not None:
+        set_clauses.append("n.name = $new_name")
+        set_clauses.append("n.name_lower = $new_name_lower")
+        params["new_name"] = new_name
+        params["new_name_lower"] = new_name.lower()
+    if summary is not None:
+        set_clauses.append("n.summary = $summary")
+        params["summary"] = summary
+    if start_date is not None:
+        start_year, start_approximate = parse_date(start_date)
+        set_clauses.append("n.start_year = $start_year")
+        set_clauses.append("n.start_approximate = $start_approximate")
+        params["start_year"] = start_year
+        params["start_approximate"] = start_approximate
+    if end_date is not None:
+        end_year, end_approximate = parse_date(end_date)
+        set_clauses.append("n.end_year = $end_year")
+        set_clauses.append("n.end_approximate = $end_approximate")
+        params["end_year"] = end_year
+        params["end_approximate"] = end_approximate
+    if notes is not None:
+        set_clauses.append("n.notes = $notes")
+        params["notes"] = notes
+    if source is not None:
+        set_clauses.append("n.source_license = $source")
+        params["source"] = source
+
+    if not set_clauses and not tags:
+        print("No fields to update.", file=sys.stderr)
+        sys.exit(1)
 
-        if set_clauses:
-            query = f"""
-            MATCH (e:Event) WHERE toLower(e.name) = toLower($name)
-            SET {", ".join(set_clauses)}
-            """
-            session.run(query, **params)
-
-        # Add new tags (existing tags are preserved)
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (e:Event) WHERE toLower(e.name) = toLower($name)
-                    MATCH (t:Tag {name: $tag})
-                    MERGE (e)-[:HAS_TAG]->(t)
-                    """,
-                    name=name,
-                    tag=tag,
-                )
+    found = session.execute_write(
+        update_node, "Event", "name_lower", name.lower(), set_clauses, params, tags
+    )
+    if not found:
+        check_lower_properties()
+        print(f"Error: Event '{name}' not found.", file=sys.stderr)
+        sys.exit(1)
 
     print(f"Updated Event: {new_name or name}")
     if tags:
@@ -1321,7 +1722,7 @@ def update_event(
 
 
 def update_qa(
-    driver,
+    session,
     question: str,
     new_question: Optional[str] = None,
     answer: Optional[str] = None,
@@ -1333,61 +1734,39 @@ def update_qa(
     if tags:
         validate_entity_tags(tags)
 
-    with driver.session() as session:
-        # Find QA
-        result = session.run(
-            "MATCH (q:QA) WHERE toLower(q.question) = toLower($question) RETURN q",
-            question=question,
-        )
-        record = result.single()
-        if not record:
-            print(
-                f"Error: QA with question '{question[:50]}...' not found.",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-
-        # Build SET clauses for provided fields
-        set_clauses = []
-        params: dict = {"question": question}
-
-        if new_question is not None:
-            set_clauses.append("q.question = $new_question")
-            params["new_question"] = new_question
-        if answer is not None:
-            set_clauses.append("q.answer = $answer")
-            params["answer"] = answer
-        if notes is not None:
-            set_clauses.append("q.notes = $notes")
-            params["notes"] = notes
-        if source is not None:
-            set_clauses.append("q.source_license = $source")
-            params["source"] = source
-
-        if not set_clauses and not tags:
-            print("No fields to update.", file=sys.stderr)
-            sys.exit(1)
+    # Build SET clauses for provided fields
+    set_clauses = []
+    params: dict = {}
+
+    if new_question is not None:
+        set_clauses.append("n.question = $new_question")
+        set_clauses.append("n.question_lower = $new_question_lower")
+        params["new_question"] = new_question
+        params["new_question_lower"] = new_question.lower()
+    if answer is not None:
+        set_clauses.append("n.answer = $answer")
+        params["answer"] = answer
+    if notes is not None:
+        set_clauses.append("n.notes = $notes")
+        params["notes"] = notes
+    if source is not None:
+        set_clauses.append("n.source_license = $source")
+        params["source"] = source
+
+    if not set_clauses and not tags:
+        print("No fields to update.", file=sys.stderr)
+        sys.exit(1)
 
-        if set_clauses:
-            query = f"""
-            MATCH (q:QA) WHERE toLower(q.question) = toLower($question)
-            SET {", ".join(set_clauses)}
-            """
-            session.run(query, **params)
-
-        # Add new tags (existing tags are preserved)
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (q:QA) WHERE toLower(q.question) = toLower($question)
-                    MATCH (t:Tag {name: $tag})
-                    MERGE (q)-[:HAS_TAG]->(t)
-                    """,
-                    question=question,
-                    tag=tag,
-                )
+    found = session.execute_write(
+        update_node, "QA", "question_lower", question.lower(), set_clauses, params, tags
+    )
+    if not found:
+        check_lower_properties()
+        print(
+            f"Error: QA with question '{question[:50]}...' not found.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
     print(f"Updated QA: {(new_question or question)[:60]}...")
     if tags:
@@ -1395,7 +1774,7 @@ def update_qa(
 
 
 def update_cloze(
-    driver,
+    session,
     text: str,
     new_text: Optional[str] = None,
     notes: Optional[str] = None,
@@ -1406,62 +1785,38 @@ def update_cloze(
     if tags:
         validate_entity_tags(tags)
 
-    with driver.session() as session:
-        # Find Cloze
-        result = session.run(
-            "MATCH (c:Cloze) WHERE toLower(c.text) = toLower($text) RETURN c",
-            text=text,
-        )
-        record = result.single()
-        if not record:
-            print(
-                f"Error: Cloze with text '{text[:50]}...' not found.", file=sys.stderr
-            )
-            sys.exit(1)
-
-        # Build SET clauses for provided fields
-        set_clauses = []
-        params: dict = {"text": text}
+    # Build SET clauses for provided fields
+    set_clauses = []
+    params: dict = {}
 
-        if new_text is not None:
-            # Validate new cloze text
-            is_valid, error_msg = validate_cloze_text(new_text)
-            if not is_valid:
-                print(f"Error: Invalid cloze text. {error_msg}", file=sys.stderr)
-                sys.exit(1)
-            set_clauses.append("c.text = $new_text")
-            params["new_text"] = new_text
-        if notes is not None:
-            set_clauses.append("c.notes = $notes")
-            params["notes"] = notes
-        if source is not None:
-            set_clauses.append("c.source_license = $source")
-            params["source"] = source
-
-        if not set_clauses and not tags:
-            print("No fields to update.", file=sys.stderr)
+    if new_text is not None:
+        # Validate new cloze text
+        is_valid, error_msg = validate_cloze_text(new_text)
+        if not is_valid:
+            print(f"Error: Invalid cloze text. {error_msg}", file=sys.stderr)
             sys.exit(1)
+        set_clauses.append("n.text = $new_text")
+        set_clauses.append("n.text_lower = $new_text_lower")
+        params["new_text"] = new_text
+        params["new_text_lower"] = new_text.lower()
+    if notes is not None:
+        set_clauses.append("n.notes = $notes")
+        params["notes"] = notes
+    if source is not None:
+        set_clauses.append("n.source_license = $source")
+        params["source"] = source
+
+    if not set_clauses and not tags:
+        print("No fields to update.", file=sys.stderr)
+        sys.exit(1)
 
-        if set_clauses:
-            query = f"""
-            MATCH (c:Cloze) WHERE toLower(c.text) = toLower($text)
-            SET {", ".join(set_clauses)}
-            """
-            session.run(query, **params)
-
-        # Add new tags (existing tags are preserved)
-        if tags:
-            for tag in tags:
-                session.run("MERGE (t:Tag {name: $tag})", tag=tag)
-                session.run(
-                    """
-                    MATCH (c:Cloze) WHERE toLower(c.text) = toLower($text)
-                    MATCH (t:Tag {name: $tag})
-                    MERGE (c)-[:HAS_TAG]->(t)
-                    """,
-                    text=text,
-                    tag=tag,
-                )
+    found = session.execute_write(
+        update_node, "Cloze", "text_lower", text.lower(), set_clauses, params, tags
+    )
+    if not found:
+        check_lower_properties()
+        print(f"Error: Cloze with text '{text[:50]}...' not found.", file=sys.stderr)
+        sys.exit(1)
 
     preview = (new_text or text)[:60].replace("\n", " ")
     print(f"Updated Cloze: {preview}...")
@@ -1469,51 +1824,259 @@ def update_cloze(
         print(f"  Added tags: {', '.join(tags)}")
 
 
-def delete_entity(driver, name: str):
+def delete_entity(session, name: str):
     """Delete an entity by name."""
-    with driver.session() as session:
-        # Find entity
-        result = session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event OR n:QA OR n:Cloze)
-              AND toLower(coalesce(n.name, n.question, n.text)) = toLower($name)
-            RETURN n, labels(n)[0] AS type
-            """,
-            name=name,
-        )
-        record = result.single()
-        if not record:
-            print(f"Error: Entity '{name}' not found.", file=sys.stderr)
-            sys.exit(1)
+    # Find and delete the entity with all its relationships in one statement
+    deleted = session.execute_write(
+        collect_records,
+        ENTITY_BY_NAME_MATCH
+        + """
+        WITH n, labels(n)[0] AS type
+        DETACH DELETE n
+        RETURN type
+        """,
+        name_lower=name.lower(),
+    )
+    if not deleted:
+        check_lower_properties()
+        print(f"Error: Entity '{name}' not found.", file=sys.stderr)
+        sys.exit(1)
 
-        entity_type = record["type"]
+    print(f"Deleted {deleted[0]['type']}: {name}")
 
-        # Delete entity and all its relationships
-        session.run(
-            """
-            MATCH (n)
-            WHERE (n:Person OR n:Event OR n:QA OR n:Cloze)
-              AND toLower(coalesce(n.name, n.question, n.text)) = toLower($name)
-            DETACH DELETE n
-            """,
-            name=name,
-        )
 
-    print(f"Deleted {entity_type}: {name}")
+def date_argument(value: str) -> str:
+    """Check a date argument (e.g. "1815" or "c. 500 BCE") while parsing.
 
+    The string itself is returned, as the commands parse it again.
+    """
+    try:
+        parse_date(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date '{value}', use a year like 1815, c. 1760 or 500 BCE"
+        ) from None
+    return value
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Query and modify Neo4j database for Ultimate History data",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+
+def add_entity_arguments(parser: argparse.ArgumentParser):
+    """Add the --tag, --notes and --source arguments of the create commands."""
+    parser.add_argument("--tag", action="append", dest="tags", help="Tag (can repeat)")
+    parser.add_argument("--notes", help="Additional notes")
+    parser.add_argument("--source", help="Source & license info")
+
+
+def add_tags_arguments(parser: argparse.ArgumentParser):
+    """Add the tags arguments."""
+    parser.add_argument("--limit", type=int, default=100, help="Max tags to show")
+
+
+def add_list_arguments(parser: argparse.ArgumentParser):
+    """Add the list arguments."""
+    parser.add_argument(
+        "type", choices=["person", "event", "qa", "cloze"], help="Entity type"
+    )
+    parser.add_argument("--limit", type=int, default=50, help="Max entities to show")
+
+
+def add_search_arguments(parser: argparse.ArgumentParser):
+    """Add the search arguments."""
+    parser.add_argument("query", help="Search query")
+    parser.add_argument("--limit", type=int, default=20, help="Max results to show")
+    parser.add_argument(
+        "--lucene",
+        action="store_true",
+        help='Pass the query to the full-text index as is (e.g. "napoleon~")',
+    )
+
+
+def add_show_arguments(parser: argparse.ArgumentParser):
+    """Add the show arguments."""
+    parser.add_argument("name", help="Entity name (exact match)")
+
+
+def add_relations_arguments(parser: argparse.ArgumentParser):
+    """Add the relations arguments."""
+    parser.add_argument("name", help="Entity name (exact match)")
+
+
+def add_find_related_arguments(parser: argparse.ArgumentParser):
+    """Add the find-related arguments."""
+    parser.add_argument("name", help="Name of the new entity")
+    parser.add_argument("--start", type=date_argument, help="Start year (e.g., 1789)")
+    parser.add_argument("--end", type=date_argument, help="End year (e.g., 1815)")
+    parser.add_argument(
+        "--tag", action="append", dest="tags", help="Filter by tag (can repeat)"
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Max results to show")
+
+
+def add_cypher_arguments(parser: argparse.ArgumentParser):
+    """Add the cypher arguments."""
+    parser.add_argument("query", help="Cypher query to run")
+
+
+def add_create_person_arguments(parser: argparse.ArgumentParser):
+    """Add the create-person arguments."""
+    parser.add_argument("name", help="Person's name")
+    parser.add_argument("--known-for", required=True, help="What they're known for")
+    parser.add_argument("--birth", type=date_argument, required=True, help="Birth year")
+    parser.add_argument("--death", type=date_argument, required=True, help="Death year")
+    add_entity_arguments(parser)
+    parser.add_argument(
+        "--picture", help='Picture HTML (e.g., <img src="uh_name.jpg">)'
+    )
+
+
+def add_create_event_arguments(parser: argparse.ArgumentParser):
+    """Add the create-event arguments."""
+    parser.add_argument("name", help="Event name")
+    parser.add_argument("--summary", required=True, help="Event summary")
+    parser.add_argument("--start", type=date_argument, required=True, help="Start year")
+    parser.add_argument("--end", type=date_argument, required=True, help="End year")
+    add_entity_arguments(parser)
+
+
+def add_create_persons_bulk_arguments(parser: argparse.ArgumentParser):
+    """Add the create-persons-bulk arguments."""
+    parser.add_argument(
+        "--file",
+        required=True,
+        help="JSON list of objects with name, known_for, birth, death and "
+        "optional tags, notes, source, picture",
+    )
+
+
+def add_create_events_bulk_arguments(parser: argparse.ArgumentParser):
+    """Add the create-events-bulk arguments."""
+    parser.add_argument(
+        "--file",
+        required=True,
+        help="JSON list of objects with name, summary, start, end and "
+        "optional tags, notes, source",
+    )
+
+
+def add_bulk_import_arguments(parser: argparse.ArgumentParser):
+    """Add the bulk-import arguments."""
+    parser.add_argument(
+        "--file",
+        required=True,
+        help="JSON object with any of persons, events, qas, clozes and "
+        "relationships lists, whose entries have the fields of create-person, "
+        "create-event, create-qa, create-cloze and add-rel (source, target, "
+        "description)",
+    )
+
+
+def add_create_qa_arguments(parser: argparse.ArgumentParser):
+    """Add the create-qa arguments."""
+    parser.add_argument("question", help="The question")
+    parser.add_argument("--answer", required=True, help="The answer")
+    add_entity_arguments(parser)
+
+
+def add_create_cloze_arguments(parser: argparse.ArgumentParser):
+    """Add the create-cloze arguments."""
+    parser.add_argument("text", help="Cloze text with {{c1::deletions}}")
+    add_entity_arguments(parser)
+
+
+def add_create_tag_arguments(parser: argparse.ArgumentParser):
+    """Add the create-tag arguments."""
+    parser.add_argument(
+        "name", help="Tag name (must start with UH::Region:: or UH::Period::)"
+    )
+
+
+def add_add_rel_arguments(parser: argparse.ArgumentParser):
+    """Add the add-rel arguments."""
+    parser.add_argument("source", help="Source entity name")
+    parser.add_argument("target", help="Target entity name")
+    parser.add_argument("description", help="Relationship description")
+
+
+def add_delete_rel_arguments(parser: argparse.ArgumentParser):
+    """Add the delete-rel arguments."""
+    parser.add_argument("source", help="Source entity name")
+    parser.add_argument("target", help="Target entity name")
+
+
+def add_update_person_arguments(parser: argparse.ArgumentParser):
+    """Add the update-person arguments."""
+    parser.add_argument("name", help="Current person name")
+    parser.add_argument("--new-name", help="New name")
+    parser.add_argument("--known-for", help="What they're known for")
+    parser.add_argument(
+        "--birth", type=date_argument, help="Birth year (e.g., 1815, c. 500 BCE)"
+    )
+    parser.add_argument("--death", type=date_argument, help="Death year")
+    parser.add_argument("--notes", help="Additional notes")
+    parser.add_argument("--source", help="Source & license info")
+    parser.add_argument(
+        "--picture", help='Picture HTML (e.g., <img src="uh_name.jpg">)'
+    )
+    parser.add_argument(
+        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
+    )
+
+
+def add_update_event_arguments(parser: argparse.ArgumentParser):
+    """Add the update-event arguments."""
+    parser.add_argument("name", help="Current event name")
+    parser.add_argument("--new-name", help="New name")
+    parser.add_argument("--summary", help="Event summary")
+    parser.add_argument("--start", type=date_argument, help="Start year")
+    parser.add_argument("--end", type=date_argument, help="End year")
+    parser.add_argument("--notes", help="Additional notes")
+    parser.add_argument("--source", help="Source & license info")
+    parser.add_argument(
+        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
+    )
+
+
+def add_update_qa_arguments(parser: argparse.ArgumentParser):
+    """Add the update-qa arguments."""
+    parser.add_argument("question", help="Current question text")
+    parser.add_argument("--new-question", help="New question text")
+    parser.add_argument("--answer", help="New answer")
+    parser.add_argument("--notes", help="Additional notes")
+    parser.add_argument("--source", help="Source & license info")
+    parser.add_argument(
+        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
+    )
+
+
+def add_update_cloze_arguments(parser: argparse.ArgumentParser):
+    """Add the update-cloze arguments."""
+    parser.add_argument("text", help="Current cloze text")
+    parser.add_argument("--new-text", help="New cloze text")
+    parser.add_argument("--notes", help="Additional notes")
+    parser.add_argument("--source", help="Source & license info")
+    parser.add_argument(
+        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
+    )
+
+
+def add_delete_arguments(parser: argparse.ArgumentParser):
+    """Add the delete arguments."""
+    parser.add_argument("name", help="Entity name to delete")
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser):
+    """Add the batch arguments."""
+    parser.add_argument("--file", help="Read commands from this file instead of stdin")
+
+
+# Shown after the top-level --help; argparse fills in %(prog)s
+EXAMPLES = """
 Examples:
   # Query commands
   %(prog)s tags                         # List all tags with counts
   %(prog)s list person                  # List all persons
   %(prog)s list event --limit 100       # List 100 events
-  %(prog)s search "napoleon"            # Search for entities containing "napoleon"
+  %(prog)s search "napoleon"            # Search for words starting with "napoleon"
+  %(prog)s search --lucene "napolon~"   # Fuzzy search with Lucene syntax
   %(prog)s show "Napoleon Bonaparte"    # Show all properties of an entity
   %(prog)s relations "Napoleon Bonaparte"  # Get relationships for Napoleon
   %(prog)s find-related "New Entity" --start 1789 --end 1815 --tag UH::Region::Europe
@@ -1524,6 +2087,9 @@ Examples:
       --tag UH::Region::Europe::Central --tag UH::Period::19th_Century --tag UH::Theme::Politics
   %(prog)s create-event "Franco-Prussian War" --summary "War between France and Prussia" --start 1870 --end 1871 \\
       --tag UH::Region::Europe::Western --tag UH::Period::19th_Century --tag UH::Theme::War
+  %(prog)s create-persons-bulk --file persons.json  # Same fields as create-person
+  %(prog)s create-events-bulk --file events.json    # Same fields as create-event
+  %(prog)s bulk-import --file data.json  # {"persons": [...], "events": [...], "relationships": [...]}
   %(prog)s create-qa "What triggered the Franco-Prussian War?" --answer "The Ems Dispatch" \\
       --tag UH::Region::Europe --tag UH::Period::19th_Century
   %(prog)s create-cloze "The {{c1::Franco-Prussian War}} led to {{c2::German unification}}." \\
@@ -1539,315 +2105,413 @@ Examples:
   %(prog)s update-event "Franco-Prussian War" --summary "War that unified Germany" --end 1871
   %(prog)s update-qa "What triggered the Franco-Prussian War?" --answer "The Ems Dispatch provoked France"
   %(prog)s update-cloze "The {{c1::Franco-Prussian War}} led to..." --notes "Updated note"
-""",
-    )
 
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+  # Run many commands with one connection (one command per line, quoted like in a shell)
+  %(prog)s batch < commands.txt
+  %(prog)s batch --file commands.txt
+  %(prog)s --pool-size 10 --acquisition-timeout 30 batch --file commands.txt
 
-    # tags command
-    tags_parser = subparsers.add_parser("tags", help="List all tags")
-    tags_parser.add_argument("--limit", type=int, default=100, help="Max tags to show")
+  # Reuse the output of read-only commands for a few minutes (cleared by any write)
+  %(prog)s --cache relations "Napoleon Bonaparte"
+"""
 
-    # list command
-    list_parser = subparsers.add_parser("list", help="List entities of a type")
-    list_parser.add_argument(
-        "type", choices=["person", "event", "qa", "cloze"], help="Entity type"
-    )
-    list_parser.add_argument(
-        "--limit", type=int, default=50, help="Max entities to show"
-    )
+# Subcommand -> (help, function adding its arguments, function running it with
+# the session and parsed arguments), in --help order
+COMMANDS = {
+    "tags": (
+        "List all tags",
+        add_tags_arguments,
+        lambda session, args: list_tags(session, args.limit),
+    ),
+    "list": (
+        "List entities of a type",
+        add_list_arguments,
+        lambda session, args: list_entities(session, args.type, args.limit),
+    ),
+    "search": (
+        "Search entities by name",
+        add_search_arguments,
+        lambda session, args: search_entities(
+            session, args.query, args.limit, args.lucene
+        ),
+    ),
+    "show": (
+        "Show all properties of an entity",
+        add_show_arguments,
+        lambda session, args: show_entity(session, args.name),
+    ),
+    "relations": (
+        "Get relationships for an entity",
+        add_relations_arguments,
+        lambda session, args: get_relationships(session, args.name),
+    ),
+    "find-related": (
+        "Find potentially related entities",
+        add_find_related_arguments,
+        lambda session, args: find_related(
+            session, args.name, args.start, args.end, args.tags, args.limit
+        ),
+    ),
+    "cypher": (
+        "Run arbitrary Cypher query",
+        add_cypher_arguments,
+        lambda session, args: run_cypher(session, args.query),
+    ),
+    "create-person": (
+        "Create a new Person",
+        add_create_person_arguments,
+        lambda session, args: create_person(
+            session,
+            args.name,
+            args.known_for,
+            args.birth,
+            args.death,
+            args.tags,
+            args.notes,
+            args.source,
+            args.picture,
+        ),
+    ),
+    "create-event": (
+        "Create a new Event",
+        add_create_event_arguments,
+        lambda session, args: create_event(
+            session,
+            args.name,
+            args.summary,
+            args.start,
+            args.end,
+            args.tags,
+            args.notes,
+            args.source,
+        ),
+    ),
+    "create-persons-bulk": (
+        "Create Persons from a JSON file",
+        add_create_persons_bulk_arguments,
+        lambda session, args: create_persons_bulk(session, args.file),
+    ),
+    "create-events-bulk": (
+        "Create Events from a JSON file",
+        add_create_events_bulk_arguments,
+        lambda session, args: create_events_bulk(session, args.file),
+    ),
+    "bulk-import": (
+        "Create entities and relationships from one JSON file",
+        add_bulk_import_arguments,
+        lambda session, args: bulk_import(session, args.file),
+    ),
+    "create-qa": (
+        "Create a new QA card",
+        add_create_qa_arguments,
+        lambda session, args: create_qa(
+            session,
+            args.question,
+            args.answer,
+            args.tags,
+            args.notes,
+            args.source,
+        ),
+    ),
+    "create-cloze": (
+        "Create a new Cloze card",
+        add_create_cloze_arguments,
+        lambda session, args: create_cloze(
+            session,
+            args.text,
+            args.tags,
+            args.notes,
+            args.source,
+        ),
+    ),
+    "create-tag": (
+        "Create a new tag (Region or Period only)",
+        add_create_tag_arguments,
+        lambda session, args: create_tag(session, args.name),
+    ),
+    "add-rel": (
+        "Add a relationship between entities",
+        add_add_rel_arguments,
+        lambda session, args: add_relationship(
+            session, args.source, args.target, args.description
+        ),
+    ),
+    "delete-rel": (
+        "Delete a relationship between entities",
+        add_delete_rel_arguments,
+        lambda session, args: delete_relationship(session, args.source, args.target),
+    ),
+    "update-person": (
+        "Update an existing Person",
+        add_update_person_arguments,
+        lambda session, args: update_person(
+            session,
+            args.name,
+            args.new_name,
+            args.known_for,
+            args.birth,
+            args.death,
+            args.notes,
+            args.source,
+            args.picture,
+            args.tags,
+        ),
+    ),
+    "update-event": (
+        "Update an existing Event",
+        add_update_event_arguments,
+        lambda session, args: update_event(
+            session,
+            args.name,
+            args.new_name,
+            args.summary,
+            args.start,
+            args.end,
+            args.notes,
+            args.source,
+            args.tags,
+        ),
+    ),
+    "update-qa": (
+        "Update an existing QA",
+        add_update_qa_arguments,
+        lambda session, args: update_qa(
+            session,
+            args.question,
+            args.new_question,
+            args.answer,
+            args.notes,
+            args.source,
+            args.tags,
+        ),
+    ),
+    "update-cloze": (
+        "Update an existing Cloze",
+        add_update_cloze_arguments,
+        lambda session, args: update_cloze(
+            session,
+            args.text,
+            args.new_text,
+            args.notes,
+            args.source,
+            args.tags,
+        ),
+    ),
+    "delete": (
+        "Delete an entity",
+        add_delete_arguments,
+        lambda session, args: delete_entity(session, args.name),
+    ),
+    "batch": (
+        "Run commands read from stdin, one per line",
+        add_batch_arguments,
+        # Each command gets its own session on the shared driver
+        lambda session, args: run_batch(args.file, args.cache),
+    ),
+}
 
-    # search command
-    search_parser = subparsers.add_parser("search", help="Search entities by name")
-    search_parser.add_argument("query", help="Search query")
-    search_parser.add_argument(
-        "--limit", type=int, default=20, help="Max results to show"
-    )
 
-    # show command
-    show_parser = subparsers.add_parser("show", help="Show all properties of an entity")
-    show_parser.add_argument("name", help="Entity name (exact match)")
+def build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the argument parser.
 
-    # relations command
-    rel_parser = subparsers.add_parser(
-        "relations", help="Get relationships for an entity"
+    With a command, only that subcommand is added. With "", all subcommands
+    are added without their arguments or --help, to find the command to
+    run, and with None the full parser is built.
+    """
+    parser = argparse.ArgumentParser(
+        description="Query and modify Neo4j database for Ultimate History data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EXAMPLES,
     )
-    rel_parser.add_argument("name", help="Entity name (exact match)")
-
-    # find-related command
-    find_parser = subparsers.add_parser(
-        "find-related", help="Find potentially related entities"
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        help="Maximum connections in the driver pool (overrides NEO4J_MAX_POOL_SIZE)",
     )
-    find_parser.add_argument("name", help="Name of the new entity")
-    find_parser.add_argument("--start", help="Start year (e.g., 1789)")
-    find_parser.add_argument("--end", help="End year (e.g., 1815)")
-    find_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Filter by tag (can repeat)"
+    parser.add_argument(
+        "--acquisition-timeout",
+        type=float,
+        help="Seconds to wait for a pooled connection "
+        "(overrides NEO4J_ACQUISITION_TIMEOUT)",
     )
-    find_parser.add_argument(
-        "--limit", type=int, default=20, help="Max results to show"
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Reuse the output of read-only commands for {CACHE_TTL} seconds",
     )
 
-    # cypher command
-    cypher_parser = subparsers.add_parser("cypher", help="Run arbitrary Cypher query")
-    cypher_parser.add_argument("query", help="Cypher query to run")
-
-    # create-person command
-    create_person_parser = subparsers.add_parser(
-        "create-person", help="Create a new Person"
-    )
-    create_person_parser.add_argument("name", help="Person's name")
-    create_person_parser.add_argument(
-        "--known-for", required=True, help="What they're known for"
-    )
-    create_person_parser.add_argument("--birth", required=True, help="Birth year")
-    create_person_parser.add_argument("--death", required=True, help="Death year")
-    create_person_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag (can repeat)"
-    )
-    create_person_parser.add_argument("--notes", help="Additional notes")
-    create_person_parser.add_argument("--source", help="Source & license info")
-    create_person_parser.add_argument(
-        "--picture", help='Picture HTML (e.g., <img src="uh_name.jpg">)'
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+    if command:
+        # Only the command being run is registered, as no other subparser
+        # is used when a valid command is given
+        help_text, add_arguments, _ = COMMANDS[command]
+        add_arguments(subparsers.add_parser(command, help=help_text))
+        return parser
+
+    # The top-level --help and unknown commands list every command. Without
+    # a command to run, only their names and help are needed.
+    for name, (help_text, add_arguments, _) in COMMANDS.items():
+        subparser = subparsers.add_parser(
+            name, help=help_text, add_help=command is None
+        )
+        if command is None:
+            add_arguments(subparser)
+
+    return parser
+
+
+# --cache: output of these read-only commands is reused for CACHE_TTL
+# seconds. Any other command clears the cache, since it may have written.
+CACHED_COMMANDS = frozenset(
+    {"tags", "list", "search", "show", "relations", "find-related"}
+)
+CACHE_TTL = 300
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "ultimate-history"
+    / "neo4j_query"
+)
+# Arguments that don't change a command's output
+UNCACHED_ARGS = frozenset({"cache", "pool_size", "acquisition_timeout"})
+
+
+def cache_path(args: argparse.Namespace) -> Path:
+    """Get the cache file for a command and its arguments on this database."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    key = repr(
+        (
+            os.environ.get("NEO4J_URI"),
+            sorted(
+                (name, value)
+                for name, value in vars(args).items()
+                if name not in UNCACHED_ARGS
+            ),
+        )
     )
+    return CACHE_DIR / f"{hashlib.blake2b(key.encode()).hexdigest()}.txt"
 
-    # create-event command
-    create_event_parser = subparsers.add_parser(
-        "create-event", help="Create a new Event"
-    )
-    create_event_parser.add_argument("name", help="Event name")
-    create_event_parser.add_argument("--summary", required=True, help="Event summary")
-    create_event_parser.add_argument("--start", required=True, help="Start year")
-    create_event_parser.add_argument("--end", required=True, help="End year")
-    create_event_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag (can repeat)"
-    )
-    create_event_parser.add_argument("--notes", help="Additional notes")
-    create_event_parser.add_argument("--source", help="Source & license info")
-
-    # create-qa command
-    create_qa_parser = subparsers.add_parser("create-qa", help="Create a new QA card")
-    create_qa_parser.add_argument("question", help="The question")
-    create_qa_parser.add_argument("--answer", required=True, help="The answer")
-    create_qa_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag (can repeat)"
-    )
-    create_qa_parser.add_argument("--notes", help="Additional notes")
-    create_qa_parser.add_argument("--source", help="Source & license info")
 
-    # create-cloze command
-    create_cloze_parser = subparsers.add_parser(
-        "create-cloze", help="Create a new Cloze card"
-    )
-    create_cloze_parser.add_argument("text", help="Cloze text with {{c1::deletions}}")
-    create_cloze_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag (can repeat)"
-    )
-    create_cloze_parser.add_argument("--notes", help="Additional notes")
-    create_cloze_parser.add_argument("--source", help="Source & license info")
+def clear_cache():
+    """Remove all cached command output."""
+    if CACHE_DIR.is_dir():
+        for path in CACHE_DIR.glob("*.txt"):
+            path.unlink(missing_ok=True)
 
-    # create-tag command
-    create_tag_parser = subparsers.add_parser(
-        "create-tag", help="Create a new tag (Region or Period only)"
-    )
-    create_tag_parser.add_argument(
-        "name", help="Tag name (must start with UH::Region:: or UH::Period::)"
-    )
 
-    # add-rel command
-    add_rel_parser = subparsers.add_parser(
-        "add-rel", help="Add a relationship between entities"
-    )
-    add_rel_parser.add_argument("source", help="Source entity name")
-    add_rel_parser.add_argument("target", help="Target entity name")
-    add_rel_parser.add_argument("description", help="Relationship description")
+def run_cached_command(args: argparse.Namespace):
+    """Run a read-only command, reusing its output if cached recently."""
+    path = cache_path(args)
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL:
+            sys.stdout.write(path.read_text(encoding="utf-8"))
+            return
+    except FileNotFoundError:
+        pass
 
-    # delete-rel command
-    delete_rel_parser = subparsers.add_parser(
-        "delete-rel", help="Delete a relationship between entities"
-    )
-    delete_rel_parser.add_argument("source", help="Source entity name")
-    delete_rel_parser.add_argument("target", help="Target entity name")
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            run_command(args)
+    finally:
+        sys.stdout.write(output.getvalue())
+    # Only reached on success, as commands exit on errors
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path.write_text(output.getvalue(), encoding="utf-8")
 
-    # update-person command
-    update_person_parser = subparsers.add_parser(
-        "update-person", help="Update an existing Person"
-    )
-    update_person_parser.add_argument("name", help="Current person name")
-    update_person_parser.add_argument("--new-name", help="New name")
-    update_person_parser.add_argument("--known-for", help="What they're known for")
-    update_person_parser.add_argument(
-        "--birth", help="Birth year (e.g., 1815, c. 500 BCE)"
-    )
-    update_person_parser.add_argument("--death", help="Death year")
-    update_person_parser.add_argument("--notes", help="Additional notes")
-    update_person_parser.add_argument("--source", help="Source & license info")
-    update_person_parser.add_argument(
-        "--picture", help='Picture HTML (e.g., <img src="uh_name.jpg">)'
-    )
-    update_person_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
-    )
 
-    # update-event command
-    update_event_parser = subparsers.add_parser(
-        "update-event", help="Update an existing Event"
-    )
-    update_event_parser.add_argument("name", help="Current event name")
-    update_event_parser.add_argument("--new-name", help="New name")
-    update_event_parser.add_argument("--summary", help="Event summary")
-    update_event_parser.add_argument("--start", help="Start year")
-    update_event_parser.add_argument("--end", help="End year")
-    update_event_parser.add_argument("--notes", help="Additional notes")
-    update_event_parser.add_argument("--source", help="Source & license info")
-    update_event_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
-    )
+def run_command(args: argparse.Namespace, cache: bool = False):
+    """Run a parsed command in its own session on the shared driver."""
+    if cache and args.command in CACHED_COMMANDS:
+        run_cached_command(args)
+        return
 
-    # update-qa command
-    update_qa_parser = subparsers.add_parser("update-qa", help="Update an existing QA")
-    update_qa_parser.add_argument("question", help="Current question text")
-    update_qa_parser.add_argument("--new-question", help="New question text")
-    update_qa_parser.add_argument("--answer", help="New answer")
-    update_qa_parser.add_argument("--notes", help="Additional notes")
-    update_qa_parser.add_argument("--source", help="Source & license info")
-    update_qa_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
+    # Commands run as managed read or write transactions, which the driver
+    # retries on transient errors. Cypher results are pulled in small
+    # batches so rows that are never printed are not sent.
+    session_config = (
+        {"fetch_size": MAX_CYPHER_ROWS + 1} if args.command == "cypher" else {}
     )
+    try:
+        with get_driver().session(**session_config) as session:
+            _, _, run = COMMANDS[args.command]
+            run(session, args)
+    finally:
+        if args.command not in CACHED_COMMANDS and args.command != "batch":
+            clear_cache()
 
-    # update-cloze command
-    update_cloze_parser = subparsers.add_parser(
-        "update-cloze", help="Update an existing Cloze"
-    )
-    update_cloze_parser.add_argument("text", help="Current cloze text")
-    update_cloze_parser.add_argument("--new-text", help="New cloze text")
-    update_cloze_parser.add_argument("--notes", help="Additional notes")
-    update_cloze_parser.add_argument("--source", help="Source & license info")
-    update_cloze_parser.add_argument(
-        "--tag", action="append", dest="tags", help="Tag to add (can repeat)"
-    )
 
-    # delete command
-    delete_parser = subparsers.add_parser("delete", help="Delete an entity")
-    delete_parser.add_argument("name", help="Entity name to delete")
+def run_batch(path: str | None = None, cache: bool = False):
+    """Run commands read one per line from a file or stdin on one driver.
 
-    args = parser.parse_args()
+    Lines are split like shell arguments, and blank lines and # comments are
+    skipped. A failing command is reported and the remaining ones still run.
+    """
+    from neo4j.exceptions import DriverError, Neo4jError
+
+    parser = build_parser()
+    failed = 0
+    # Only close the file if we opened it, not stdin
+    with open(path, encoding="utf-8") if path else nullcontext(sys.stdin) as lines:
+        for line_number, line in enumerate(lines, 1):
+            try:
+                argv = shlex.split(line, comments=True)
+                if not argv:
+                    continue
+                if argv[0] == "batch":
+                    raise ValueError("batch cannot be nested")
+                line_args = parser.parse_args(argv)
+                # The driver is shared, so its settings can't change per line
+                if (
+                    line_args.pool_size is not None
+                    or line_args.acquisition_timeout is not None
+                ):
+                    raise ValueError(
+                        "--pool-size and --acquisition-timeout must be given "
+                        "before batch, not on its lines"
+                    )
+                run_command(line_args, cache or line_args.cache)
+            except (ValueError, Neo4jError, DriverError) as e:
+                print(f"Error: Line {line_number}: {e}", file=sys.stderr)
+                failed += 1
+            except SystemExit as e:
+                # Commands and argparse exit on errors, --help exits with 0
+                if e.code:
+                    print(f"Error: Line {line_number} failed.", file=sys.stderr)
+                    failed += 1
+
+    if failed:
+        print(f"{failed} command(s) failed.", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    argv = sys.argv[1:]
+    # The command is the first positional argument after the global options.
+    # Unknown commands are reported by this parser with all commands listed.
+    command = build_parser("").parse_known_args(argv)[0].command
+    parser = build_parser(command or "")
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    driver = get_driver()
+    # The flags take precedence over the variables get_driver reads
+    if args.pool_size is not None:
+        os.environ["NEO4J_MAX_POOL_SIZE"] = str(args.pool_size)
+    if args.acquisition_timeout is not None:
+        os.environ["NEO4J_ACQUISITION_TIMEOUT"] = str(args.acquisition_timeout)
 
     try:
-        if args.command == "tags":
-            list_tags(driver, args.limit)
-        elif args.command == "list":
-            list_entities(driver, args.type, args.limit)
-        elif args.command == "search":
-            search_entities(driver, args.query, args.limit)
-        elif args.command == "show":
-            show_entity(driver, args.name)
-        elif args.command == "relations":
-            get_relationships(driver, args.name)
-        elif args.command == "find-related":
-            find_related(driver, args.name, args.start, args.end, args.tags, args.limit)
-        elif args.command == "cypher":
-            run_cypher(driver, args.query)
-        elif args.command == "create-person":
-            create_person(
-                driver,
-                args.name,
-                args.known_for,
-                args.birth,
-                args.death,
-                args.tags,
-                args.notes,
-                args.source,
-                args.picture,
-            )
-        elif args.command == "create-event":
-            create_event(
-                driver,
-                args.name,
-                args.summary,
-                args.start,
-                args.end,
-                args.tags,
-                args.notes,
-                args.source,
-            )
-        elif args.command == "create-qa":
-            create_qa(
-                driver,
-                args.question,
-                args.answer,
-                args.tags,
-                args.notes,
-                args.source,
-            )
-        elif args.command == "create-cloze":
-            create_cloze(
-                driver,
-                args.text,
-                args.tags,
-                args.notes,
-                args.source,
-            )
-        elif args.command == "create-tag":
-            create_tag(driver, args.name)
-        elif args.command == "add-rel":
-            add_relationship(driver, args.source, args.target, args.description)
-        elif args.command == "delete-rel":
-            delete_relationship(driver, args.source, args.target)
-        elif args.command == "update-person":
-            update_person(
-                driver,
-                args.name,
-                args.new_name,
-                args.known_for,
-                args.birth,
-                args.death,
-                args.notes,
-                args.source,
-                args.picture,
-                args.tags,
-            )
-        elif args.command == "update-event":
-            update_event(
-                driver,
-                args.name,
-                args.new_name,
-                args.summary,
-                args.start,
-                args.end,
-                args.notes,
-                args.source,
-                args.tags,
-            )
-        elif args.command == "update-qa":
-            update_qa(
-                driver,
-                args.question,
-                args.new_question,
-                args.answer,
-                args.notes,
-                args.source,
-                args.tags,
-            )
-        elif args.command == "update-cloze":
-            update_cloze(
-                driver,
-                args.text,
-                args.new_text,
-                args.notes,
-                args.source,
-                args.tags,
-            )
-        elif args.command == "delete":
-            delete_entity(driver, args.name)
-    finally:
-        driver.close()
+        run_command(args, args.cache)
+    except BrokenPipeError:
+        # Output piped into e.g. head was closed early. Point stdout at
+        # devnull so flushing it at exit doesn't fail again.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,22 @@
 """Shared utilities for Ultimate History tools."""
 
 import csv
+import html
 import re
 from difflib import SequenceMatcher
+from functools import cache
 from pathlib import Path
 from typing import Optional, TextIO
 
+# Runs of HTML tags and whitespace, each collapsed to a single space
+TAGS_AND_WHITESPACE_RE = re.compile(r"(?:<[^>]+>|\s)+")
+# parse_reference: relationship separators in order of preference, the
+# parenthesised dates and the dash between two dates
+REFERENCE_SEPARATOR_RES = (re.compile(r":\s*"), re.compile(r"[–—]\s+"))
+PARENTHESES_RE = re.compile(r"\(([^)]+)\)")
+DIGIT_RE = re.compile(r"\d")
+DATE_RANGE_RE = re.compile(r"\s*[–—-]\s*")
+
 
 def parse_reference(
     value: str,
@@ -30,8 +41,8 @@ def parse_reference(
     # Find the last occurrence of a separator that's likely the relationship separator
     # It should be near the end or followed by descriptive text
     separator_match = None
-    for sep_pattern in [r":\s*", r"[–—]\s+"]:
-        matches = list(re.finditer(sep_pattern, value))
+    for sep_re in REFERENCE_SEPARATOR_RES:
+        matches = list(sep_re.finditer(value))
         if matches:
             # Take the last match
             separator_match = matches[-1]
@@ -46,7 +57,7 @@ def parse_reference(
 
     # Now parse before_sep to extract name and dates
     # Dates should be in the last set of parentheses
-    paren_matches = list(re.finditer(r"\(([^)]+)\)", before_sep))
+    paren_matches = list(PARENTHESES_RE.finditer(before_sep))
 
     if paren_matches:
         last_paren = paren_matches[-1]
@@ -54,9 +65,9 @@ def parse_reference(
         name = before_sep[: last_paren.start()].strip()
 
         # Check if this looks like dates (contains digits)
-        if re.search(r"\d", dates_str):
+        if DIGIT_RE.search(dates_str):
             # Parse the dates
-            date_parts = re.split(r"\s*[–—-]\s*", dates_str)
+            date_parts = DATE_RANGE_RE.split(dates_str)
             if len(date_parts) == 1:
                 date1 = date_parts[0].strip()
                 date2 = None
@@ -119,6 +130,15 @@ def fuzzy_match(name: str, candidates: dict, threshold: float = 0.8) -> Optional
     return best_match
 
 
+@cache
+def strip_html(text: str) -> str:
+    """Strip HTML tags from text but keep cloze markers."""
+    # Unescape HTML entities first
+    text = html.unescape(text)
+    # Remove HTML tags and normalize whitespace in one pass
+    return TAGS_AND_WHITESPACE_RE.sub(" ", text).strip()
+
+
 def get_data_dir() -> Path:
     """Get the data directory path (src/data from project root)."""
     # Assumes utils.py is in tools/